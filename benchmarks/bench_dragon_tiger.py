@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+龙虎榜席位索引基准
+
+合成 3 年（750 个交易日）历史: 每日 60 只上榜股票 × 10 个席位，席位池 3000 个，
+测量逐日增量入库耗时与滚动窗口查询延迟
+
+Usage:
+    python benchmarks/bench_dragon_tiger.py
+"""
+
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analyzers.dragon_tiger import DragonTigerStore
+
+N_DAYS = 750
+STOCKS_PER_DAY = 60
+SEATS_PER_STOCK = 10
+N_SEATS = 3000
+N_STOCKS = 5000
+N_QUERIES = 1000
+
+
+def main():
+    rng = random.Random(7)
+    seats = [f"某某证券第{i}营业部" for i in range(N_SEATS)]
+    codes = [f"{i:06d}" for i in range(N_STOCKS)]
+    store = DragonTigerStore(hot_money={name: f"游资{i}" for i, name in enumerate(seats[:50])})
+
+    day = date(2022, 1, 3)
+    start = time.perf_counter()
+    for _ in range(N_DAYS):
+        records = [
+            {
+                "code": code,
+                "seat": rng.choice(seats),
+                "buy": rng.uniform(0, 1e8),
+                "sell": rng.uniform(0, 1e8),
+            }
+            for code in rng.sample(codes, STOCKS_PER_DAY)
+            for _ in range(SEATS_PER_STOCK)
+        ]
+        store.add_day(day, records)
+        day += timedelta(days=1)
+    ingest = time.perf_counter() - start
+    print(f"入库: {len(store)} 条记录, {store.seat_count} 个席位, {N_DAYS} 天, "
+          f"{ingest:.2f}s ({ingest / N_DAYS * 1000:.2f} ms/天)")
+
+    for days in (5, 20, 250):
+        start = time.perf_counter()
+        for _ in range(N_QUERIES):
+            store.seat_net_by_code(rng.choice(seats), days=days)
+        seat_ms = (time.perf_counter() - start) / N_QUERIES * 1000
+
+        start = time.perf_counter()
+        for _ in range(N_QUERIES):
+            store.code_seats(rng.choice(codes), days=days, hot_money_only=True)
+        code_ms = (time.perf_counter() - start) / N_QUERIES * 1000
+        print(f"窗口 {days:3d} 日: 席位→股票 {seat_ms:.3f} ms, 股票→游资席位 {code_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
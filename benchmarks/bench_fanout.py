@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+多订阅者分发基准
+
+100 个互相重叠的自选股列表（每个 30 只，取自 200 只候选池），对比:
+- 逐用户运行: 每个订阅者各自调用 build_snapshot 采集自己的股票（同样的线程池）
+- 多租户模式: 合并去重 → 一次采集 → 并行分发
+
+Usage:
+    python benchmarks/bench_fanout.py
+"""
+
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.scheduler.fanout import Subscriber, build_snapshot, fan_out, union_codes
+
+N_SUBSCRIBERS = 100
+WATCHLIST_SIZE = 30
+POOL_SIZE = 200
+FETCH_LATENCY = 0.005  # 模拟单次接口调用耗时
+
+_calls = 0
+_lock = threading.Lock()
+
+
+def collect_stock(code):
+    global _calls
+    with _lock:
+        _calls += 1
+    time.sleep(FETCH_LATENCY)
+    return {"code": code, "close": 10.0}
+
+
+def analyze_stock(code, bars):
+    return {"code": code, "signal": bars["close"] > 9}
+
+
+def render(subscriber, snapshot):
+    stocks = snapshot.for_subscriber(subscriber)
+    return "\n".join(f"{code}: {data['signal']}" for code, data in stocks.items())
+
+
+def make_subscribers():
+    rng = random.Random(42)
+    pool = [f"{600000 + i:06d}" for i in range(POOL_SIZE)]
+    # 热门股权重更高，模拟真实重叠
+    weights = [1 / (i + 1) for i in range(POOL_SIZE)]
+    subscribers = []
+    for i in range(N_SUBSCRIBERS):
+        codes = set()
+        while len(codes) < WATCHLIST_SIZE:
+            codes.add(rng.choices(pool, weights)[0])
+        subscribers.append(Subscriber(f"user{i:03d}", [{"code": c} for c in sorted(codes)]))
+    return subscribers
+
+
+def main():
+    global _calls
+    subscribers = make_subscribers()
+
+    _calls = 0
+    start = time.perf_counter()
+    # 与多租户模式使用同一个 build_snapshot，两者只差采集次数
+    for sub in subscribers:
+        build_snapshot(sub.codes, collect_stock, analyze_stock)
+    naive_time, naive_calls = time.perf_counter() - start, _calls
+
+    _calls = 0
+    start = time.perf_counter()
+    codes = union_codes(subscribers)
+    snapshot = build_snapshot(codes, collect_stock, analyze_stock)
+    collect_time = time.perf_counter() - start
+    reports = fan_out(subscribers, snapshot, render)
+    fanout_time, fanout_calls = time.perf_counter() - start, _calls
+
+    assert all(reports.values())
+    print(f"订阅者: {len(subscribers)}，去重后股票: {len(codes)}")
+    print(f"逐用户运行: {naive_calls:5d} 次采集, {naive_time:6.2f}s")
+    print(f"多租户模式: {fanout_calls:5d} 次采集, {fanout_time:6.2f}s (采集 {collect_time:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark for MemoryToolHandler search and range views.
+
+Creates a synthetic memory directory with thousands of small memory files
+plus one large log file, then measures:
+
+- search latency through the inverted index vs. a full scan of every file
+- view_range latency on the large file vs. reading and numbering the whole file
+
+Usage:
+    python bench_memory_tool.py [--files 5000] [--large-lines 200000]
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from memory_tool import MemoryToolHandler
+
+WORDS = (
+    "user prefers concise answers project deadline budget review python rust "
+    "database migration schema latency cache index deploy rollback incident "
+    "customer invoice meeting notes follow up decision owner priority"
+).split()
+
+
+def timed(fn, repeat: int) -> float:
+    """Median wall time of fn() in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def scan_search(root: Path, query: str) -> list[str]:
+    """Baseline: read every file and grep for the query words."""
+    words = query.lower().split()
+    hits = []
+    for path in root.rglob("*.md"):
+        text = path.read_text(encoding="utf-8").lower()
+        if all(word in text for word in words):
+            hits.append(str(path))
+    return hits
+
+
+def full_view(path: Path, view_range: list[int]) -> str:
+    """Baseline: the original view implementation (read and split the whole file)."""
+    lines = path.read_text(encoding="utf-8").splitlines()
+    start = max(1, view_range[0]) - 1
+    lines = lines[start : view_range[1]]
+    return "\n".join(f"{i + start + 1:4d}: {line}" for i, line in enumerate(lines))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--large-lines", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        handler = MemoryToolHandler(tmp)
+        for i in range(args.files):
+            lines = [" ".join(rng.choices(WORDS, k=8)) for _ in range(40)]
+            lines.append(f"ticket-{i} tag{i % 97}")
+            handler.execute(
+                command="create",
+                path=f"/memories/topic{i % 50}/note{i}.md",
+                file_text="\n".join(lines) + "\n",
+            )
+        large = "/memories/logs/session.md"
+        handler.execute(
+            command="create",
+            path=large,
+            file_text="".join(f"step {n}: {' '.join(rng.choices(WORDS, k=10))}\n" for n in range(args.large_lines)),
+        )
+        print(f"{args.files} memory files + 1 file with {args.large_lines} lines")
+
+        start = time.perf_counter()
+        handler.execute(command="search", query="warmup")
+        print(f"index build (first search): {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        for query in ("tag42", "ticket 1234", "incident rollback deadline"):
+            indexed = timed(lambda: handler.execute(command="search", query=query), 5)
+            scanned = timed(lambda: scan_search(handler.memory_root, query), 3)
+            print(f"search {query!r:30} index {indexed:8.2f} ms   full scan {scanned:8.1f} ms")
+
+        path = handler.memory_root / "logs" / "session.md"
+        middle = args.large_lines // 2
+        for view_range in ([1, 50], [middle, middle + 50], [args.large_lines - 50, -1]):
+            paged = timed(lambda: handler.execute(command="view", path=large, view_range=view_range), 20)
+            whole = timed(lambda: full_view(path, view_range), 5)
+            print(f"view_range {str(view_range):18} seek {paged:6.2f} ms   full read {whole:6.1f} ms")
+
+        handler.execute(command="str_replace", path=large, old_str="step 0:", new_str="step zero:")
+        edited = timed(lambda: handler.execute(command="view", path=large, view_range=[middle, middle + 50]), 1)
+        print(f"view_range after edit (offset index rebuilt): {edited:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,159 @@ This implementation provides secure, client-side execution of memory operations
 with path validation, error handling, and comprehensive security measures.
 """
 
+import re
 import shutil
+from array import array
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
+# Number of files whose line-offset index is kept in memory for range views
+LINE_INDEX_CACHE_SIZE = 256
+
+# Matching lines shown per file in search results
+MAX_LINES_PER_FILE = 5
+
+# CJK text has no word boundaries, so it is indexed as characters and
+# character bigrams; everything else is split into lowercase words.
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_WORD_RE = re.compile(f"[^\\W{_CJK}]+")
+_CJK_RE = re.compile(f"[{_CJK}]+")
+
+# UTF-8 encodings of every line boundary recognised by str.splitlines()
+_LINE_BREAK_RE = re.compile(rb"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+_RARE_LINE_BREAKS = (b"\r", b"\x0b", b"\x0c", b"\x1c", b"\x1d", b"\x1e", b"\xc2\x85", b"\xe2\x80\xa8", b"\xe2\x80\xa9")
+_NEWLINE_RE = re.compile(rb"\n")
+
+
+def _tokenize(text: str, query: bool = False) -> set[str]:
+    """
+    Split text into search terms.
+
+    Documents index CJK runs as single characters plus bigrams. Queries use
+    bigrams (or the character itself for one-character runs) so that longer
+    CJK queries stay selective.
+    """
+    text = text.lower()
+    terms = set(_WORD_RE.findall(text))
+    for run in set(_CJK_RE.findall(text)):
+        bigrams = [run[i : i + 2] for i in range(len(run) - 1)]
+        if query:
+            terms.update(bigrams or [run])
+        else:
+            terms.update(run)
+            terms.update(bigrams)
+    return terms
+
+
+def _is_hidden(key: str) -> bool:
+    return any(part.startswith(".") for part in key.split("/"))
+
+
+class MemorySearchIndex:
+    """
+    Inverted index from search terms to memory files.
+
+    Keys are paths relative to the memory root in POSIX form. The index is
+    kept up to date by MemoryToolHandler after every write. Files modified
+    outside the handler are re-indexed when they show up as candidates; files
+    added outside it are picked up the next time the index is built.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.postings: dict[str, set[str]] = {}
+        self.file_terms: dict[str, frozenset[str]] = {}
+        self.file_stats: dict[str, tuple[int, int]] = {}
+
+    def build(self) -> None:
+        """Index every visible file under the memory root."""
+        self.add_tree(self.root)
+
+    def add_tree(self, path: Path) -> None:
+        """Index a file, or every file below a directory."""
+        if path.is_file():
+            self.add(path)
+            return
+        for child in sorted(path.rglob("*")):
+            if child.is_file():
+                self.add(child)
+
+    def key(self, path: Path) -> str:
+        return path.relative_to(self.root).as_posix()
+
+    def add(self, path: Path) -> None:
+        """(Re-)index a single file; non-UTF-8 and hidden files are skipped."""
+        key = self.key(path)
+        self._discard(key)
+        if _is_hidden(key):
+            return
+        try:
+            stat = path.stat()
+            text = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return
+        terms = frozenset(_tokenize(text))
+        self.file_terms[key] = terms
+        self.file_stats[key] = (stat.st_mtime_ns, stat.st_size)
+        for term in terms:
+            self.postings.setdefault(term, set()).add(key)
+
+    def _keys_under(self, key: str) -> list[str]:
+        if key in self.file_terms:
+            return [key]
+        return [k for k in self.file_terms if k.startswith(key + "/")]
+
+    def _discard(self, key: str) -> None:
+        terms = self.file_terms.pop(key, None)
+        if terms is None:
+            return
+        del self.file_stats[key]
+        for term in terms:
+            keys = self.postings[term]
+            keys.discard(key)
+            if not keys:
+                del self.postings[term]
+
+    def remove(self, key: str) -> None:
+        """Drop a file, or every file below a directory, from the index."""
+        for k in self._keys_under(key):
+            self._discard(k)
+
+    def move(self, old_key: str, new_key: str) -> None:
+        """Re-key a renamed file or directory without re-reading its contents."""
+        keys = self._keys_under(old_key)
+        if not keys:
+            # Nothing indexed under the source (e.g. a hidden file made visible)
+            self.add_tree(self.root / new_key)
+            return
+        for k in keys:
+            moved = new_key + k[len(old_key) :]
+            if _is_hidden(moved):
+                self._discard(k)
+                continue
+            terms = self.file_terms.pop(k)
+            self.file_terms[moved] = terms
+            self.file_stats[moved] = self.file_stats.pop(k)
+            for term in terms:
+                keys = self.postings[term]
+                keys.discard(k)
+                keys.add(moved)
+
+    def is_stale(self, key: str) -> bool:
+        try:
+            stat = (self.root / key).stat()
+        except OSError:
+            return True
+        return self.file_stats.get(key) != (stat.st_mtime_ns, stat.st_size)
+
+    def candidates(self, terms: set[str]) -> list[str]:
+        """Files containing every term, sorted by path."""
+        postings = sorted((self.postings.get(term, set()) for term in terms), key=len)
+        if not postings or not postings[0]:
+            return []
+        return sorted(postings[0].intersection(*postings[1:]))
+
 
 class MemoryToolHandler:
     """
@@ -18,6 +167,10 @@ class MemoryToolHandler:
     system through a standardized tool interface. This handler provides client-side
     implementation with security controls.
 
+    Range views seek through a cached line-offset index instead of reading the
+    whole file, and the search command is served from an inverted index that is
+    built on first use and updated by every write command.
+
     Attributes:
         base_path: Root directory for memory storage
         memory_root: The /memories directory within base_path
@@ -33,6 +186,8 @@ class MemoryToolHandler:
         self.base_path = Path(base_path).resolve()
         self.memory_root = self.base_path / "memories"
         self.memory_root.mkdir(parents=True, exist_ok=True)
+        self._line_index: OrderedDict[Path, tuple[tuple[int, int], array]] = OrderedDict()
+        self._search_index: MemorySearchIndex | None = None
 
     def _validate_path(self, path: str) -> Path:
         """
@@ -90,6 +245,7 @@ class MemoryToolHandler:
             - insert: Insert text at a specific line
             - delete: Delete a file or directory
             - rename: Rename or move a file/directory
+            - search: Find files and lines containing the query terms
         """
         command = params.get("command")
 
@@ -106,16 +262,106 @@ class MemoryToolHandler:
                 return self._delete(params)
             elif command == "rename":
                 return self._rename(params)
+            elif command == "search":
+                return self._search(params)
             else:
                 return {
                     "error": f"Unknown command: '{command}'. "
-                    "Valid commands are: view, create, str_replace, insert, delete, rename"
+                    "Valid commands are: view, create, str_replace, insert, delete, rename, search"
                 }
         except ValueError as e:
             return {"error": str(e)}
         except Exception as e:
             return {"error": f"Unexpected error executing {command}: {e}"}
 
+    def _line_offsets(self, full_path: Path) -> tuple[array, int]:
+        """
+        Return the byte offset of every line start in a file, plus its size.
+
+        Offsets are cached per file and reused while mtime and size are unchanged.
+        """
+        stat = full_path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._line_index.get(full_path)
+        if cached is not None and cached[0] == signature:
+            self._line_index.move_to_end(full_path)
+            return cached[1], stat.st_size
+
+        # Scan in chunks for the same line boundaries str.splitlines() uses.
+        # The last two bytes of a chunk are carried over so that "\r\n" and
+        # multi-byte separators split across chunks are matched whole.
+        offsets = array("q", [0] if stat.st_size else [])
+        base = 0
+        buffer = b""
+        with open(full_path, "rb") as f:
+            while True:
+                chunk = f.read(1 << 20)
+                buffer += chunk
+                limit = len(buffer) if not chunk else len(buffer) - 2
+                consumed = 0
+                # Plain "\n" files (the common case) skip the slower alternation
+                if any(sep in buffer for sep in _RARE_LINE_BREAKS):
+                    pattern = _LINE_BREAK_RE
+                else:
+                    pattern = _NEWLINE_RE
+                for match in pattern.finditer(buffer):
+                    if match.start() >= limit:
+                        break
+                    consumed = match.end()
+                    offsets.append(base + consumed)
+                if not chunk:
+                    break
+                keep = max(consumed, limit)
+                base += keep
+                buffer = buffer[keep:]
+        if offsets and offsets[-1] == stat.st_size:
+            offsets.pop()  # a trailing line break does not start another line
+
+        self._line_index[full_path] = (signature, offsets)
+        if len(self._line_index) > LINE_INDEX_CACHE_SIZE:
+            self._line_index.popitem(last=False)
+        return offsets, stat.st_size
+
+    def _read_line_range(self, full_path: Path, view_range: list[int]) -> tuple[list[str], int]:
+        """Read only the requested lines, returning them with the first line number."""
+        offsets, size = self._line_offsets(full_path)
+        total = len(offsets)
+
+        start = max(1, view_range[0]) - 1
+        end = view_range[1]
+        if end == -1:
+            end = total
+        elif end < 0:
+            end = max(total + end, 0)
+        else:
+            end = min(end, total)
+        if start >= end:
+            return [], start + 1
+
+        stop = offsets[end] if end < total else size
+        with open(full_path, "rb") as f:
+            f.seek(offsets[start])
+            text = f.read(stop - offsets[start]).decode("utf-8")
+
+        # The span starts and ends on line boundaries, so splitlines() yields
+        # exactly the requested lines
+        return text.splitlines(), start + 1
+
+    def _forget(self, full_path: Path) -> None:
+        """Drop cached line offsets for a path and everything below it."""
+        for cached in [p for p in self._line_index if p == full_path or full_path in p.parents]:
+            del self._line_index[cached]
+
+    def _file_changed(self, full_path: Path) -> None:
+        self._forget(full_path)
+        if self._search_index is not None:
+            self._search_index.add(full_path)
+
+    def _path_removed(self, full_path: Path) -> None:
+        self._forget(full_path)
+        if self._search_index is not None:
+            self._search_index.remove(self._search_index.key(full_path))
+
     def _view(self, params: dict[str, Any]) -> dict[str, str]:
         """View directory contents or file contents."""
         path = params.get("path")
@@ -147,16 +393,11 @@ class MemoryToolHandler:
         # Handle file reading
         elif full_path.is_file():
             try:
-                content = full_path.read_text(encoding="utf-8")
-                lines = content.splitlines()
-
-                # Apply view range if specified
+                # Apply view range if specified, reading only the requested lines
                 if view_range:
-                    start_line = max(1, view_range[0]) - 1  # Convert to 0-indexed
-                    end_line = len(lines) if view_range[1] == -1 else view_range[1]
-                    lines = lines[start_line:end_line]
-                    start_num = start_line + 1
+                    lines, start_num = self._read_line_range(full_path, view_range)
                 else:
+                    lines = full_path.read_text(encoding="utf-8").splitlines()
                     start_num = 1
 
                 # Format with line numbers
@@ -194,6 +435,7 @@ class MemoryToolHandler:
 
             # Write the file
             full_path.write_text(file_text, encoding="utf-8")
+            self._file_changed(full_path)
             return {"success": f"File created successfully at {path}"}
 
         except Exception as e:
@@ -231,6 +473,7 @@ class MemoryToolHandler:
             # Perform replacement
             new_content = content.replace(old_str, new_str, 1)
             full_path.write_text(new_content, encoding="utf-8")
+            self._file_changed(full_path)
 
             return {"success": f"File {path} has been edited successfully"}
 
@@ -266,6 +509,7 @@ class MemoryToolHandler:
 
             # Write back
             full_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            self._file_changed(full_path)
 
             return {"success": f"Text inserted at line {insert_line} in {path}"}
 
@@ -301,9 +545,11 @@ class MemoryToolHandler:
         try:
             if full_path.is_file():
                 full_path.unlink()
+                self._path_removed(full_path)
                 return {"success": f"File deleted: {path}"}
             elif full_path.is_dir():
                 shutil.rmtree(full_path)
+                self._path_removed(full_path)
                 return {"success": f"Directory deleted: {path}"}
 
         except Exception as e:
@@ -335,12 +581,75 @@ class MemoryToolHandler:
 
             # Perform rename/move
             old_full_path.rename(new_full_path)
+            self._forget(old_full_path)
+            if self._search_index is not None:
+                self._search_index.move(
+                    self._search_index.key(old_full_path), self._search_index.key(new_full_path)
+                )
 
             return {"success": f"Renamed {old_path} to {new_path}"}
 
         except Exception as e:
             return {"error": f"Cannot rename {old_path} to {new_path}: {e}"}
 
+    def _search(self, params: dict[str, Any]) -> dict[str, str]:
+        """Search memory files for the query terms."""
+        query = params.get("query")
+        path = params.get("path", "/memories")
+        max_results = params.get("max_results", 20)
+
+        if not query:
+            return {"error": "Missing required parameter: query"}
+
+        full_path = self._validate_path(path)
+        if not full_path.exists():
+            return {"error": f"Path not found: {path}"}
+
+        terms = _tokenize(query, query=True)
+        if not terms:
+            return {"error": f"Query '{query}' contains no searchable words"}
+
+        if self._search_index is None:
+            self._search_index = MemorySearchIndex(self.memory_root.resolve())
+            self._search_index.build()
+        index = self._search_index
+
+        scope = index.key(full_path) if full_path != index.root else ""
+        matches = []
+        for key in index.candidates(terms):
+            if scope and key != scope and not key.startswith(scope + "/"):
+                continue
+            if index.is_stale(key):
+                # Changed outside the handler: re-index and re-check the terms
+                index.add(index.root / key)
+                if not terms <= index.file_terms.get(key, frozenset()):
+                    continue
+            matches.append(key)
+
+        if not matches:
+            return {"success": f"No matches for '{query}' in {path}"}
+
+        # Only the files that are shown are read, and only up to the line cap
+        output = [f"Found {len(matches)} file(s) matching '{query}' in {path}:"]
+        for key in matches[:max_results]:
+            output.append(f"/memories/{key}")
+            try:
+                text = (index.root / key).read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                continue
+            shown = 0
+            for number, line in enumerate(text.splitlines(), 1):
+                lowered = line.lower()
+                if any(term in lowered for term in terms):
+                    if shown == MAX_LINES_PER_FILE:
+                        output.append("      ... more matching lines")
+                        break
+                    output.append(f"{number:4d}: {line}")
+                    shown += 1
+        if len(matches) > max_results:
+            output.append(f"... {len(matches) - max_results} more file(s)")
+        return {"success": "\n".join(output)}
+
     def clear_all_memory(self) -> dict[str, str]:
         """
         Clear all memory files (useful for testing or starting fresh).
@@ -357,6 +666,8 @@ class MemoryToolHandler:
             if self.memory_root.exists():
                 shutil.rmtree(self.memory_root)
             self.memory_root.mkdir(parents=True, exist_ok=True)
+            self._line_index.clear()
+            self._search_index = None
             return {"success": "All memory cleared successfully"}
         except Exception as e:
             return {"error": f"Cannot clear memory: {e}"}
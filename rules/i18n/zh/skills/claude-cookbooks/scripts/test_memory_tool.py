@@ -0,0 +1,156 @@
+"""
+Tests for MemoryToolHandler range views and the search index.
+
+Range views are checked against the original behaviour (read the whole file,
+splitlines(), slice). Search results are checked after every write command.
+
+Usage:
+    python -m pytest rules/i18n/zh/skills/claude-cookbooks/scripts/test_memory_tool.py
+"""
+
+import pytest
+
+from memory_tool import MemoryToolHandler
+
+CHUNK = 1 << 20  # read size used by the line-offset scan
+
+
+@pytest.fixture
+def handler(tmp_path):
+    return MemoryToolHandler(base_path=str(tmp_path))
+
+
+def full_read_view(path, view_range):
+    """Range view as implemented before the line-offset index."""
+    lines = path.read_text(encoding="utf-8").splitlines()
+    start = max(1, view_range[0]) - 1
+    end = len(lines) if view_range[1] == -1 else view_range[1]
+    return "\n".join(f"{i + start + 1:4d}: {line}" for i, line in enumerate(lines[start:end]))
+
+
+def found(handler, query, path="/memories"):
+    """Memory paths listed in a search result."""
+    result = handler.execute(command="search", query=query, path=path)
+    assert "success" in result, result
+    return [line for line in result["success"].splitlines() if line.startswith("/memories/")]
+
+
+RANGES = [[1, -1], [1, 1], [2, 3], [3, -1], [0, 2], [4, 100], [1, -2], [50, 60]]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "alpha\nbeta\ngamma\ndelta\n",
+        "alpha\r\nbeta\r\ngamma\r\ndelta",
+        "alpha\rbeta\rgamma\r\rdelta\r",
+        "alpha\x85beta gamma delta\x0bepsilon\x0czeta\x1ceta",
+        "混合\r\n行尾\n\r空行\x85\n中文",
+        "",
+        "\n\n\n",
+    ],
+)
+def test_view_range_matches_full_read(handler, content):
+    path = handler.memory_root / "notes.txt"
+    path.write_bytes(content.encode("utf-8"))
+
+    for view_range in RANGES:
+        result = handler.execute(command="view", path="/memories/notes.txt", view_range=view_range)
+        assert result == {"success": full_read_view(path, view_range)}, view_range
+
+
+@pytest.mark.parametrize("separator", ["\r\n", "\x85", " "])
+@pytest.mark.parametrize("shift", [0, 1, 2])
+def test_view_range_separator_across_chunks(handler, separator, shift):
+    # Place the separator so that it straddles (or just touches) a chunk boundary
+    encoded = separator.encode("utf-8")
+    head = "x" * (CHUNK - len(encoded) + shift)
+    content = f"{head}{separator}second\nthird{separator}fourth"
+    path = handler.memory_root / "big.txt"
+    path.write_bytes(content.encode("utf-8"))
+
+    for view_range in ([2, 2], [2, -1], [1, 2], [3, 4]):
+        result = handler.execute(command="view", path="/memories/big.txt", view_range=view_range)
+        assert result == {"success": full_read_view(path, view_range)}, view_range
+
+
+def test_view_range_refreshes_after_external_edit(handler):
+    path = handler.memory_root / "notes.txt"
+    path.write_text("one\ntwo\nthree\n", encoding="utf-8")
+    assert handler.execute(command="view", path="/memories/notes.txt", view_range=[2, 2]) == {"success": "   2: two"}
+
+    path.write_text("one\r\n2\r\nthree and more\r\n", encoding="utf-8", newline="")
+    assert handler.execute(command="view", path="/memories/notes.txt", view_range=[2, 3]) == {
+        "success": full_read_view(path, [2, 3])
+    }
+
+
+def test_search_follows_write_commands(handler):
+    assert handler.execute(command="create", path="/memories/a.md", file_text="deploy rollback plan\n")
+    assert found(handler, "rollback") == ["/memories/a.md"]
+
+    # create after the index exists
+    handler.execute(command="create", path="/memories/notes/b.md", file_text="rollback 数据库迁移\n")
+    assert found(handler, "rollback") == ["/memories/a.md", "/memories/notes/b.md"]
+    assert found(handler, "迁移") == ["/memories/notes/b.md"]
+
+    # str_replace drops old terms and adds new ones
+    handler.execute(command="str_replace", path="/memories/a.md", old_str="rollback", new_str="canary")
+    assert found(handler, "rollback") == ["/memories/notes/b.md"]
+    assert found(handler, "canary") == ["/memories/a.md"]
+
+    # insert
+    handler.execute(command="insert", path="/memories/a.md", insert_line=0, insert_text="incident review")
+    assert found(handler, "incident") == ["/memories/a.md"]
+    assert found(handler, "canary") == ["/memories/a.md"]
+
+    # rename a file, then a directory
+    handler.execute(command="rename", old_path="/memories/a.md", new_path="/memories/archive/a.md")
+    assert found(handler, "canary") == ["/memories/archive/a.md"]
+    handler.execute(command="rename", old_path="/memories/notes", new_path="/memories/old-notes")
+    assert found(handler, "迁移") == ["/memories/old-notes/b.md"]
+
+    # delete a file, then a directory
+    handler.execute(command="create", path="/memories/archive/c.md", file_text="canary again\n")
+    handler.execute(command="delete", path="/memories/archive/a.md")
+    assert found(handler, "canary") == ["/memories/archive/c.md"]
+    handler.execute(command="delete", path="/memories/archive")
+    assert found(handler, "canary") == []
+    assert found(handler, "rollback") == ["/memories/old-notes/b.md"]
+
+
+def test_rename_hidden_path_to_visible(handler):
+    handler.execute(command="create", path="/memories/.draft.md", file_text="secret launch plan\n")
+    handler.execute(command="create", path="/memories/.drafts/q3.md", file_text="launch budget\n")
+    handler.execute(command="create", path="/memories/seed.md", file_text="seed\n")
+    assert found(handler, "launch") == []
+
+    handler.execute(command="rename", old_path="/memories/.draft.md", new_path="/memories/draft.md")
+    assert found(handler, "launch") == ["/memories/draft.md"]
+
+    handler.execute(command="rename", old_path="/memories/.drafts", new_path="/memories/drafts")
+    assert found(handler, "launch") == ["/memories/draft.md", "/memories/drafts/q3.md"]
+
+    # and back to hidden
+    handler.execute(command="rename", old_path="/memories/drafts", new_path="/memories/.drafts")
+    assert found(handler, "launch") == ["/memories/draft.md"]
+
+
+def test_rename_unindexed_file(handler):
+    handler.execute(command="create", path="/memories/seed.md", file_text="seed\n")
+    assert found(handler, "seed") == ["/memories/seed.md"]
+
+    # Added outside the handler, so the index does not know about it yet
+    (handler.memory_root / "external.md").write_text("orphan notes\n", encoding="utf-8")
+    handler.execute(command="rename", old_path="/memories/external.md", new_path="/memories/kept/external.md")
+    assert found(handler, "orphan") == ["/memories/kept/external.md"]
+
+
+def test_search_scope_and_external_edit(handler):
+    handler.execute(command="create", path="/memories/x/one.md", file_text="budget\n")
+    handler.execute(command="create", path="/memories/y/two.md", file_text="budget\n")
+    assert found(handler, "budget", path="/memories/x") == ["/memories/x/one.md"]
+
+    # Modified outside the handler: the stale entry is re-checked
+    (handler.memory_root / "y" / "two.md").write_text("nothing here\n", encoding="utf-8")
+    assert found(handler, "budget") == ["/memories/x/one.md"]
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+快速备份基准测试
+
+在临时目录生成合成项目（默认 10 万个小文件，含若干被 .gitignore 排除的目录），
+依次测量:
+  1. 忽略规则匹配耗时（编译后的单一正则）
+  2. 完整备份耗时与体积
+  3. 修改 1% 文件后的增量备份耗时与体积
+  4. 无变化时的增量备份耗时
+
+使用方法：
+  $ python3 backups/备份基准.py
+  $ python3 backups/备份基准.py --files 20000 -c gz
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import importlib
+
+backup = importlib.import_module('快速备份')
+
+GITIGNORE = """\
+__pycache__/
+*.pyc
+*.log
+node_modules
+build/
+!keep.log
+"""
+
+
+def make_tree(root: Path, n_files: int, seed: int = 0):
+    """生成合成项目：每个目录 100 个文件，约 10% 落在被忽略的位置"""
+    rng = random.Random(seed)
+    (root / '.gitignore').write_text(GITIGNORE, encoding='utf-8')
+    for i in range(n_files):
+        d = root / f'pkg{i // 10000}' / f'mod{i // 100}'
+        r = rng.random()
+        if r < 0.03:
+            d = d / '__pycache__'
+        elif r < 0.06:
+            d = d / 'node_modules'
+        d.mkdir(parents=True, exist_ok=True)
+        suffix = '.log' if r > 0.97 else '.py'
+        (d / f'f{i}{suffix}').write_text(f'# file {i}\n' + 'x = 1\n' * rng.randint(1, 50), encoding='utf-8')
+
+
+def run(label: str, fn):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    print(f"{label}: {time.perf_counter() - start:.2f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='快速备份基准测试')
+    parser.add_argument('--files', type=int, default=100_000, help='合成文件数（默认: 100000）')
+    parser.add_argument('-c', '--compress', choices=['zstd', 'gz'],
+                        default='zstd' if backup.zstandard is not None else 'gz')
+    args = parser.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix='backup_bench_'))
+    try:
+        root = work / 'project'
+        out = work / 'out'
+        out.mkdir()
+        root.mkdir()
+        print(f"生成 {args.files} 个文件 ...")
+        make_tree(root, args.files)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            filter_obj = backup.GitignoreFilter(root / '.gitignore', root)
+
+        files, excluded = run('扫描 + 规则匹配', lambda: backup.scan_files(root, filter_obj))
+        print(f"  待备份 {len(files)} 个文件，排除 {excluded} 个文件/目录")
+
+        manifest = out / 'manifest.json'
+        suffix = '.tar.zst' if args.compress == 'zstd' else '.tar.gz'
+
+        def backup_to(name, incremental):
+            target = out / f'{name}{suffix}'
+            ok = backup.create_backup(root, target, filter_obj, manifest_path=manifest,
+                                      incremental=incremental, compression=args.compress, quiet=True)
+            assert ok
+            return target
+
+        full = run(f'完整备份 ({args.compress})', lambda: backup_to('full', False))
+        print(f"  体积 {full.stat().st_size / 1024 / 1024:.2f} MB")
+
+        rng = random.Random(1)
+        for rel, _, _ in rng.sample(files, max(len(files) // 100, 1)):
+            with open(root / rel, 'a', encoding='utf-8') as f:
+                f.write('y = 2\n')
+
+        inc = run('增量备份 (1% 文件变化)', lambda: backup_to('inc', True))
+        print(f"  体积 {inc.stat().st_size / 1024 / 1024:.2f} MB")
+
+        run('增量备份 (无变化)', lambda: backup_to('noop', True))
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
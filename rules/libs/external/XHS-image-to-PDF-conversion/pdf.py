@@ -4,104 +4,195 @@
 将ZIP文件中的图片按序号排序并拼接成PDF文件
 """
 
+import io
 import zipfile
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from PIL import Image
-import shutil
+
+支持的格式 = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp'}
+
+# 图片宽度超过该值时按比例缩小（None 表示保持原尺寸）
+# 只限制宽度：小红书长图高度可达上万像素，按长边缩小会让文字无法辨认
+默认最大宽度 = 2000
 
 def 自然排序键(文件名):
     """将文件名转换为自然排序键，支持数字排序"""
     return [int(text) if text.isdigit() else text.lower() for text in re.split(r'(\d+)', 文件名)]
 
-def zip转pdf(zip路径):
+
+class 流式PDF:
+    """
+    逐页写入的极简 PDF 写入器
+
+    每页图片以 JPEG（DCTDecode）流的形式立即写入文件，只记录对象偏移，
+    内存占用与页数无关，只取决于当前这一页。
+    """
+
+    def __init__(self, 路径, 分辨率=72.0):
+        self.文件 = open(路径, 'wb')
+        self.分辨率 = 分辨率
+        self.偏移 = {}
+        self.页面编号 = []
+        self.下一个编号 = 3  # 1: Catalog, 2: Pages
+        self.文件.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+    def _分配编号(self):
+        编号 = self.下一个编号
+        self.下一个编号 += 1
+        return 编号
+
+    def _写对象(self, 编号, 字典, 流=None):
+        self.偏移[编号] = self.文件.tell()
+        self.文件.write(f'{编号} 0 obj\n'.encode('ascii') + 字典)
+        if 流 is not None:
+            self.文件.write(b'\nstream\n')
+            self.文件.write(流)
+            self.文件.write(b'\nendstream')
+        self.文件.write(b'\nendobj\n')
+
+    def 添加页面(self, jpeg数据, 宽, 高, 灰度=False):
+        """写入一页，jpeg数据 为该页图片的 JPEG 编码字节"""
+        图片编号 = self._分配编号()
+        内容编号 = self._分配编号()
+        页面编号 = self._分配编号()
+        色彩空间 = '/DeviceGray' if 灰度 else '/DeviceRGB'
+        self._写对象(
+            图片编号,
+            (f'<< /Type /XObject /Subtype /Image /Width {宽} /Height {高} '
+             f'/ColorSpace {色彩空间} /BitsPerComponent 8 /Filter /DCTDecode '
+             f'/Length {len(jpeg数据)} >>').encode('ascii'),
+            jpeg数据,
+        )
+        页宽 = 宽 * 72.0 / self.分辨率
+        页高 = 高 * 72.0 / self.分辨率
+        内容 = f'q {页宽:.2f} 0 0 {页高:.2f} 0 0 cm /Im0 Do Q'.encode('ascii')
+        self._写对象(内容编号, f'<< /Length {len(内容)} >>'.encode('ascii'), 内容)
+        self._写对象(
+            页面编号,
+            (f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {页宽:.2f} {页高:.2f}] '
+             f'/Resources << /XObject << /Im0 {图片编号} 0 R >> >> '
+             f'/Contents {内容编号} 0 R >>').encode('ascii'),
+        )
+        self.页面编号.append(页面编号)
+
+    def 关闭(self):
+        """写入页树、交叉引用表和 trailer"""
+        子页面 = ' '.join(f'{n} 0 R' for n in self.页面编号)
+        self._写对象(2, f'<< /Type /Pages /Kids [{子页面}] /Count {len(self.页面编号)} >>'.encode('ascii'))
+        self._写对象(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+        交叉引用位置 = self.文件.tell()
+        对象数 = self.下一个编号
+        self.文件.write(f'xref\n0 {对象数}\n0000000000 65535 f \n'.encode('ascii'))
+        for 编号 in range(1, 对象数):
+            self.文件.write(f'{self.偏移[编号]:010d} 00000 n \n'.encode('ascii'))
+        self.文件.write(
+            f'trailer\n<< /Size {对象数} /Root 1 0 R >>\nstartxref\n{交叉引用位置}\n%%EOF\n'.encode('ascii')
+        )
+        self.文件.close()
+
+
+def 列出图片成员(zip文件):
+    """返回ZIP中按文件名自然排序的图片成员（跳过目录和 macOS 元数据）"""
+    成员列表 = []
+    for 信息 in zip文件.infolist():
+        if 信息.is_dir():
+            continue
+        文件名 = 信息.filename.replace('\\', '/').rsplit('/', 1)[-1]
+        if 信息.filename.startswith('__MACOSX/') or 文件名.startswith('._'):
+            continue
+        if os.path.splitext(文件名)[1].lower() in 支持的格式:
+            成员列表.append((文件名, 信息))
+    成员列表.sort(key=lambda x: 自然排序键(x[0]))
+    return [信息 for _, 信息 in 成员列表]
+
+
+def 编码页面(原始数据, 最大宽度=默认最大宽度, 质量=95):
+    """
+    解码单张图片，必要时缩小，返回 (jpeg数据, 宽, 高, 是否灰度)
+
+    原图本身就是 RGB/灰度 JPEG 且无需缩小时直接复用原始字节，不再重新编码
+    """
+    with Image.open(io.BytesIO(原始数据)) as 图片:
+        宽, 高 = 图片.size
+        需要缩小 = 最大宽度 is not None and 宽 > 最大宽度
+        if 图片.format == 'JPEG' and 图片.mode in ('RGB', 'L') and not 需要缩小:
+            return 原始数据, 宽, 高, 图片.mode == 'L'
+
+        if 需要缩小:
+            比例 = 最大宽度 / 宽
+            目标 = (max(round(宽 * 比例), 1), max(round(高 * 比例), 1))
+            # JPEG 可在解码阶段按 1/2、1/4、1/8 缩小，避免解出整张大图
+            图片.draft('RGB' if 图片.mode != 'L' else 'L', 目标)
+            页面 = 图片.convert('L' if 图片.mode == 'L' else 'RGB').resize(目标, Image.LANCZOS)
+        else:
+            页面 = 图片.convert('L' if 图片.mode == 'L' else 'RGB')
+
+    缓冲 = io.BytesIO()
+    页面.save(缓冲, 'JPEG', quality=质量, optimize=True)
+    return 缓冲.getvalue(), 页面.width, 页面.height, 页面.mode == 'L'
+
+
+def zip转pdf(zip路径, 最大宽度=默认最大宽度, 删除原文件=True, 详细输出=True):
     """
     将ZIP文件中的图片排序后转换为PDF
 
+    直接从ZIP中逐个读取图片成员，解码（必要时缩小）后立即作为一页写入PDF，
+    不解压到临时目录，内存占用以单页为上限。
+
     Args:
         zip路径: ZIP文件的完整路径
+        最大宽度: 图片宽度上限（像素），超过则等比缩小；None 表示不缩小
+        删除原文件: 成功后是否删除原ZIP文件
+        详细输出: 是否打印处理过程
 
     Returns:
         成功返回PDF路径，失败返回None
     """
-    try:
-        # 获取ZIP文件名（不含扩展名）
-        zip目录, zip文件名 = os.path.split(zip路径)
-        pdf名称 = os.path.splitext(zip文件名)[0] + '.pdf'
-        pdf路径 = os.path.join(zip目录, pdf名称)
-
-        print(f"正在处理: {zip文件名}")
+    输出 = print if 详细输出 else (lambda *args, **kwargs: None)
+    # 获取ZIP文件名（不含扩展名）
+    zip目录, zip文件名 = os.path.split(zip路径)
+    pdf名称 = os.path.splitext(zip文件名)[0] + '.pdf'
+    pdf路径 = os.path.join(zip目录, pdf名称)
+    临时pdf路径 = pdf路径 + '.part'
 
-        # 创建临时目录解压文件
-        临时目录 = os.path.join(zip目录, 'temp_extract')
-        if os.path.exists(临时目录):
-            shutil.rmtree(临时目录)
-        os.makedirs(临时目录)
+    try:
+        输出(f"正在处理: {zip文件名}")
 
-        # 解压ZIP文件
         with zipfile.ZipFile(zip路径, 'r') as zip文件:
-            zip文件.extractall(临时目录)
-
-        # 获取所有图片文件
-        支持的格式 = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp'}
-        图片文件 = []
+            图片成员 = 列出图片成员(zip文件)
+            if not 图片成员:
+                print(f"错误: {zip文件名} 中没有找到图片文件")
+                return None
 
-        for 根目录, 目录, 文件列表 in os.walk(临时目录):
-            for 文件 in 文件列表:
-                if any(文件.lower().endswith(格式) for 格式 in 支持的格式):
-                    完整路径 = os.path.join(根目录, 文件)
-                    图片文件.append(完整路径)
+            输出(f"找到 {len(图片成员)} 张图片，开始转换...")
 
-        if not 图片文件:
-            print("错误: ZIP文件中没有找到图片文件")
-            shutil.rmtree(临时目录)
-            return None
-
-        # 按文件名自然排序
-        图片文件.sort(key=lambda x: 自然排序键(os.path.basename(x)))
-
-        print(f"找到 {len(图片文件)} 张图片，开始转换...")
-
-        # 打开第一张图片作为基础
-        图片对象列表 = []
-        for 图片路径 in 图片文件:
+            # 先写入临时文件，全部成功后再替换，避免留下半个PDF
+            写入器 = 流式PDF(临时pdf路径)
             try:
-                图片 = Image.open(图片路径)
-                # 转换为RGB模式（确保兼容性）
-                if 图片.mode != 'RGB':
-                    图片 = 图片.convert('RGB')
-                图片对象列表.append(图片)
-            except Exception as e:
-                print(f"警告: 无法打开图片 {图片路径}: {e}")
-                continue
-
-        if not 图片对象列表:
-            print("错误: 没有成功加载任何图片")
-            shutil.rmtree(临时目录)
+                for 成员 in 图片成员:
+                    try:
+                        页面 = 编码页面(zip文件.read(成员), 最大宽度)
+                    except Exception as e:
+                        print(f"警告: 无法打开图片 {成员.filename}: {e}")
+                        continue
+                    写入器.添加页面(*页面)
+            finally:
+                写入器.关闭()
+
+        if not 写入器.页面编号:
+            print(f"错误: {zip文件名} 没有成功加载任何图片")
+            os.remove(临时pdf路径)
             return None
 
-        # 保存为PDF（第一张作为主图，其余附加）
-        图片对象列表[0].save(
-            pdf路径,
-            "PDF",
-            quality=95,
-            optimize=True,
-            save_all=True,
-            append_images=图片对象列表[1:]
-        )
-
-        # 关闭所有图片对象
-        for 图片 in 图片对象列表:
-            图片.close()
-
-        # 清理临时文件
-        shutil.rmtree(临时目录)
+        os.replace(临时pdf路径, pdf路径)
+        输出(f"✓ 成功创建PDF: {pdf名称}（{len(写入器.页面编号)} 页）")
 
         # 删除原ZIP文件
-        os.remove(zip路径)
-
-        print(f"✓ 成功创建PDF: {pdf名称}")
-        print(f"✓ 已删除原ZIP文件: {zip文件名}")
+        if 删除原文件:
+            os.remove(zip路径)
+            输出(f"✓ 已删除原ZIP文件: {zip文件名}")
 
         return pdf路径
 
@@ -109,19 +200,22 @@ def zip转pdf(zip路径):
         print(f"错误: {zip路径} 不是有效的ZIP文件")
         return None
     except Exception as e:
-        print(f"处理过程中出错: {e}")
-        # 清理临时文件
-        if '临时目录' in locals() and os.path.exists(临时目录):
-            shutil.rmtree(临时目录)
+        print(f"处理 {zip文件名} 过程中出错: {e}")
+        if os.path.exists(临时pdf路径):
+            os.remove(临时pdf路径)
         return None
 
-def 批量处理当前目录():
-    """批量处理当前目录下所有ZIP文件"""
+def 批量处理当前目录(进程数=None):
+    """
+    批量处理当前目录下所有ZIP文件
+
+    各ZIP互不相关，分发到进程池并行转换；进程数默认取CPU核数
+    """
     当前目录 = os.getcwd()
     zip文件列表 = []
 
     # 扫描当前目录所有ZIP文件
-    for 文件 in os.listdir(当前目录):
+    for 文件 in sorted(os.listdir(当前目录), key=自然排序键):
         if 文件.lower().endswith('.zip'):
             zip文件列表.append(os.path.join(当前目录, 文件))
 
@@ -129,22 +223,36 @@ def 批量处理当前目录():
         print("当前目录下没有找到ZIP文件")
         return
 
-    print(f"发现 {len(zip文件列表)} 个ZIP文件，开始批量处理...")
+    进程数 = min(进程数 or os.cpu_count() or 1, len(zip文件列表))
+    print(f"发现 {len(zip文件列表)} 个ZIP文件，使用 {进程数} 个进程批量处理...")
     print("-" * 50)
 
     成功计数 = 0
     失败计数 = 0
 
-    for zip路径 in zip文件列表:
-        print(f"\n[{zip文件列表.index(zip路径) + 1}/{len(zip文件列表)}] 处理: {os.path.basename(zip路径)}")
-
-        # 执行转换
-        结果 = zip转pdf(zip路径)
-
-        if 结果:
-            成功计数 += 1
-        else:
-            失败计数 += 1
+    if 进程数 == 1:
+        for 序号, zip路径 in enumerate(zip文件列表, 1):
+            print(f"\n[{序号}/{len(zip文件列表)}] 处理: {os.path.basename(zip路径)}")
+            if zip转pdf(zip路径):
+                成功计数 += 1
+            else:
+                失败计数 += 1
+    else:
+        with ProcessPoolExecutor(max_workers=进程数) as 进程池:
+            任务 = {进程池.submit(zip转pdf, zip路径, 详细输出=False): zip路径 for zip路径 in zip文件列表}
+            for 序号, 完成 in enumerate(as_completed(任务), 1):
+                zip文件名 = os.path.basename(任务[完成])
+                try:
+                    结果 = 完成.result()
+                except Exception as e:
+                    print(f"处理 {zip文件名} 过程中出错: {e}")
+                    结果 = None
+                if 结果:
+                    成功计数 += 1
+                    print(f"[{序号}/{len(zip文件列表)}] ✓ {zip文件名} → {os.path.basename(结果)}")
+                else:
+                    失败计数 += 1
+                    print(f"[{序号}/{len(zip文件列表)}] ✗ {zip文件名}")
 
     print("-" * 50)
     print(f"批量处理完成！成功: {成功计数} 个，失败: {失败计数} 个")
@@ -4,67 +4,224 @@
 批量翻译 i18n/zh 下的所有文本文件到其他语言目录。
 - 保持目录结构，遇到代码块自动跳过翻译。
 - 目标语言集合：自动读取 i18n 下的子目录，排除 zh。
+- 翻译记忆：段落译文按 (原文哈希, 目标语言) 缓存在本地 SQLite，源文件改动后只重译变化的段落。
+- 批量请求：多个段落合并为一次请求（不超过 --batch-chars），数量对不上时再逐段翻译。
+- 并发：文件 × 语言并发执行，所有请求共享一个限速器。
 用法：
     python bulk_translate.py --src-root ../../i18n/zh --dst-root ../../i18n --src-lang zh
 可选：
     --langs en es ...   # 指定目标语言；默认自动扫描
     --overwrite         # 允许覆盖已有文件
+    --workers 8         # 并发任务数
+    --rate 5            # 每秒最多请求数
+    --tm translation_memory.db  # 翻译记忆文件
 """
 
 import argparse
-import os
+import hashlib
+import sqlite3
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Iterable, List
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
-try:
-    from deep_translator import GoogleTranslator
-except ImportError:
-    sys.stderr.write("[错误] 缺少 deep-translator，请先 pip install -r requirements.txt\n")
-    sys.exit(1)
+# 批量请求时段落之间的分隔，译文按同样方式拆回
+BATCH_SEPARATOR = "\n\n"
 
 
-def translate_blocks(text: str, translator: GoogleTranslator) -> str:
-    lines = text.splitlines()
-    translated: List[str] = []
+class RateLimiter:
+    """线程安全的限速器：相邻两次请求至少间隔 1/rate 秒"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class TranslationMemory:
+    """段落级翻译记忆，(原文 SHA-256, 目标语言) → 译文"""
+
+    def __init__(self, path: Path):
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tm ("
+                "src_hash TEXT NOT NULL, lang TEXT NOT NULL, target TEXT NOT NULL, "
+                "PRIMARY KEY (src_hash, lang))"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, texts: Iterable[str], lang: str) -> Dict[str, str]:
+        """返回已缓存的 {原文: 译文}"""
+        by_hash = {self.key(t): t for t in texts}
+        found: Dict[str, str] = {}
+        hashes = list(by_hash)
+        with self._lock:
+            # SQLite 默认单条语句最多 999 个参数
+            for i in range(0, len(hashes), 900):
+                chunk = hashes[i:i + 900]
+                rows = self._conn.execute(
+                    f"SELECT src_hash, target FROM tm WHERE lang = ? AND src_hash IN ({','.join('?' * len(chunk))})",
+                    [lang, *chunk],
+                )
+                for src_hash, target in rows:
+                    found[by_hash[src_hash]] = target
+        return found
+
+    def put_many(self, pairs: Dict[str, str], lang: str) -> None:
+        if not pairs:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tm (src_hash, lang, target) VALUES (?, ?, ?)",
+                [(self.key(src), lang, dst) for src, dst in pairs.items()],
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def split_segments(text: str) -> List[Tuple[bool, str]]:
+    """
+    按代码块与空行切分文本
+
+    Returns:
+        [(是否需要翻译, 内容)]，需翻译的为段落（多行以 \\n 连接），其余为原样保留的单行
+    """
+    segments: List[Tuple[bool, str]] = []
     in_code = False
     buffer: List[str] = []
 
     def flush_buffer():
-        if not buffer:
-            return
-        chunk = "\n".join(buffer)
-        try:
-            result = translator.translate(chunk)
-            if result is None:
-                raise RuntimeError("翻译返回空结果")
-            translated.extend(result.split("\n"))
-        except Exception:
-            # 兜底：按行逐条翻译，避免整段失败
-            for line in buffer:
-                try:
-                    res_line = translator.translate(line) or line
-                except Exception:
-                    res_line = line  # 保留原文，留待人工校对
-                translated.append(res_line)
-        buffer.clear()
-
-    for line in lines:
+        if buffer:
+            segments.append((True, "\n".join(buffer)))
+            buffer.clear()
+
+    for line in text.splitlines():
         if line.strip().startswith("```"):
             flush_buffer()
             in_code = not in_code
-            translated.append(line)
+            segments.append((False, line))
             continue
         if in_code:
-            translated.append(line)
+            segments.append((False, line))
             continue
         if not line.strip():
             flush_buffer()
-            translated.append(line)
+            segments.append((False, line))
             continue
         buffer.append(line)
     flush_buffer()
-    return "\n".join(translated)
+    return segments
+
+
+def _safe_translate(translator, text: str, limiter: Optional[RateLimiter]) -> Optional[str]:
+    if limiter:
+        limiter.wait()
+    try:
+        return translator.translate(text)
+    except Exception:
+        return None
+
+
+def translate_by_line(translator, paragraph: str, limiter: Optional[RateLimiter] = None) -> str:
+    """兜底：按行逐条翻译，失败的行保留原文，留待人工校对"""
+    lines = []
+    for line in paragraph.split("\n"):
+        lines.append(_safe_translate(translator, line, limiter) or line)
+    return "\n".join(lines)
+
+
+def make_batches(paragraphs: List[str], max_chars: int) -> List[List[str]]:
+    """按字符数上限把段落装入尽量少的批次，超长段落单独成批"""
+    batches: List[List[str]] = []
+    current: List[str] = []
+    size = 0
+    for p in paragraphs:
+        extra = len(p) + (len(BATCH_SEPARATOR) if current else 0)
+        if current and size + extra > max_chars:
+            batches.append(current)
+            current, size = [], 0
+            extra = len(p)
+        current.append(p)
+        size += extra
+    if current:
+        batches.append(current)
+    return batches
+
+
+def translate_paragraphs(
+    paragraphs: List[str],
+    translator,
+    limiter: Optional[RateLimiter] = None,
+    max_chars: int = 4500,
+) -> Tuple[Dict[str, str], List[str]]:
+    """
+    批量翻译段落
+
+    每批合并为一次请求；若译文拆分后的段数与原文不一致（译者合并/拆分了段落），
+    该批退回逐段翻译，逐段仍失败的再按行翻译
+
+    Returns:
+        ({原文: 译文}, 按行兜底的段落列表)，后者可能混有原文，不应写入翻译记忆
+    """
+    results: Dict[str, str] = {}
+    partial: List[str] = []
+    for batch in make_batches(paragraphs, max_chars):
+        if len(batch) > 1:
+            joined = _safe_translate(translator, BATCH_SEPARATOR.join(batch), limiter)
+            parts = joined.split(BATCH_SEPARATOR) if joined else []
+            if len(parts) == len(batch):
+                results.update(zip(batch, parts))
+                continue
+        for p in batch:
+            result = _safe_translate(translator, p, limiter)
+            if result is None:
+                result = translate_by_line(translator, p, limiter)
+                partial.append(p)
+            results[p] = result
+    return results, partial
+
+
+def translate_blocks(
+    text: str,
+    translator,
+    memory: Optional[TranslationMemory] = None,
+    lang: Optional[str] = None,
+    limiter: Optional[RateLimiter] = None,
+    max_chars: int = 4500,
+) -> str:
+    """翻译整篇文本，代码块与空行原样保留；提供 memory 时只翻译未命中的段落"""
+    segments = split_segments(text)
+    paragraphs = list(dict.fromkeys(s for needs, s in segments if needs))
+
+    cached = memory.get_many(paragraphs, lang) if memory else {}
+    missing = [p for p in paragraphs if p not in cached]
+    fresh, partial = translate_paragraphs(missing, translator, limiter, max_chars) if missing else ({}, [])
+    if memory:
+        memory.put_many({src: dst for src, dst in fresh.items() if src not in partial}, lang)
+
+    translated = {**cached, **fresh}
+    return "\n".join(translated[s] if needs else s for needs, s in segments)
 
 
 def iter_source_files(src_root: Path) -> Iterable[Path]:
@@ -73,6 +230,70 @@ def iter_source_files(src_root: Path) -> Iterable[Path]:
             yield path
 
 
+def run_bulk(
+    src_root: Path,
+    dst_root: Path,
+    src_lang: str,
+    target_langs: List[Tuple[str, str]],
+    translator_factory: Callable[[str, str], object],
+    memory: Optional[TranslationMemory] = None,
+    overwrite: bool = False,
+    workers: int = 8,
+    rate: float = 5.0,
+    max_chars: int = 4500,
+) -> Tuple[int, int]:
+    """
+    并发翻译所有 (文件, 语言) 组合
+
+    Args:
+        target_langs: [(目录名, 翻译后端语言代码)]
+        translator_factory: (源语言, 目标语言) -> 带 translate(text) 方法的对象，
+            便于用桩对象替换 GoogleTranslator 做测试
+
+    Returns:
+        (成功数, 失败数)
+    """
+    limiter = RateLimiter(rate)
+    local = threading.local()
+
+    def get_translator(code: str):
+        # 翻译器实例按线程 + 语言复用，避免跨线程共享会话
+        cache = getattr(local, "translators", None)
+        if cache is None:
+            cache = local.translators = {}
+        if code not in cache:
+            cache[code] = translator_factory(src_lang, code)
+        return cache[code]
+
+    def task(src_file: Path, lang: str, code: str) -> str:
+        dst_file = dst_root / lang / src_file.relative_to(src_root)
+        if dst_file.exists() and not overwrite:
+            return f"跳过已存在 {dst_file}"
+        content = src_file.read_text(encoding='utf-8')
+        translated = translate_blocks(content, get_translator(code), memory, code, limiter, max_chars)
+        dst_file.parent.mkdir(parents=True, exist_ok=True)
+        dst_file.write_text(translated + '\n', encoding='utf-8')
+        return f"[OK] {src_file} -> {dst_file}"
+
+    files = list(iter_source_files(src_root))
+    ok = failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(task, src_file, lang, code): (src_file, lang)
+            for lang, code in target_langs
+            for src_file in files
+        }
+        for future in as_completed(futures):
+            src_file, lang = futures[future]
+            try:
+                print(future.result())
+                ok += 1
+            except Exception as exc:
+                print(f"[失败] {src_file} -> {lang}: {exc}")
+                failed += 1
+    return ok, failed
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="批量翻译 i18n/zh -> 其他语言")
     parser.add_argument('--src-root', default='../../i18n/zh', help='源语言根目录')
@@ -80,8 +301,20 @@ def main() -> int:
     parser.add_argument('--src-lang', default='zh-CN', help='源语言代码')
     parser.add_argument('--langs', nargs='*', help='指定目标语言，不含源语言')
     parser.add_argument('--overwrite', action='store_true', help='允许覆盖已有文件')
+    parser.add_argument('--workers', type=int, default=8, help='并发任务数')
+    parser.add_argument('--rate', type=float, default=5.0, help='每秒最多请求数，0 表示不限速')
+    parser.add_argument('--batch-chars', type=int, default=4500, help='单次请求最多字符数（Google 上限 5000）')
+    parser.add_argument('--tm', default=str(Path(__file__).parent / 'translation_memory.db'),
+                        help='翻译记忆 SQLite 文件')
+    parser.add_argument('--no-tm', action='store_true', help='不使用翻译记忆')
     args = parser.parse_args()
 
+    try:
+        from deep_translator import GoogleTranslator
+    except ImportError:
+        sys.stderr.write("[错误] 缺少 deep-translator，请先 pip install -r requirements.txt\n")
+        return 1
+
     src_root = Path(args.src_root).resolve()
     dst_root = Path(args.dst_root).resolve()
 
@@ -107,32 +340,26 @@ def main() -> int:
         sys.stderr.write("[错误] 无目标语言目录\n")
         return 1
 
-    for lang in target_langs:
-        translator = GoogleTranslator(source=args.src_lang, target=map_code(lang))
-        print(f"==== 开始翻译 -> {lang} ====")
-        for src_file in iter_source_files(src_root):
-            rel_path = src_file.relative_to(src_root)
-            dst_file = dst_root / lang / rel_path
-            dst_file.parent.mkdir(parents=True, exist_ok=True)
-
-            if dst_file.exists() and not args.overwrite:
-                print(f"跳过已存在 {dst_file}")
-                continue
-
-            with open(src_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            try:
-                translated = translate_blocks(content, translator)
-            except Exception as exc:
-                print(f"[失败] {src_file} -> {dst_file}: {exc}")
-                continue
-
-            with open(dst_file, 'w', encoding='utf-8') as f:
-                f.write(translated + '\n')
-            print(f"[OK] {src_file} -> {dst_file}")
+    memory = None if args.no_tm else TranslationMemory(Path(args.tm))
+    print(f"==== 开始翻译 -> {', '.join(target_langs)} ====")
+    try:
+        ok, failed = run_bulk(
+            src_root,
+            dst_root,
+            args.src_lang,
+            [(lang, map_code(lang)) for lang in target_langs],
+            lambda src, tgt: GoogleTranslator(source=src, target=tgt),
+            memory=memory,
+            overwrite=args.overwrite,
+            workers=args.workers,
+            rate=args.rate,
+            max_chars=args.batch_chars,
+        )
+    finally:
+        if memory:
+            memory.close()
 
-    print("全部翻译完成")
+    print(f"全部翻译完成：成功 {ok}，失败 {failed}")
     return 0
 
 
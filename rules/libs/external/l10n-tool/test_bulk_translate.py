@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+bulk_translate 测试：用桩翻译器替代 GoogleTranslator，验证翻译记忆、批量回退与按行兜底。
+运行：
+    python -m pytest rules/libs/external/l10n-tool/test_bulk_translate.py
+"""
+
+from pathlib import Path
+
+from bulk_translate import (
+    BATCH_SEPARATOR,
+    TranslationMemory,
+    run_bulk,
+    translate_blocks,
+    translate_paragraphs,
+)
+
+
+class StubTranslator:
+    """记录每次请求；译文为 "<lang>:" 前缀 + 原文，可配置失败与合并段落"""
+
+    def __init__(self, lang="en", fail=(), merge_batches=False):
+        self.lang = lang
+        self.fail = set(fail)
+        self.merge_batches = merge_batches
+        self.calls = []
+
+    def translate(self, text):
+        self.calls.append(text)
+        if text in self.fail:
+            raise RuntimeError("translation failed")
+        if self.merge_batches and BATCH_SEPARATOR in text:
+            # 模拟译者把多个段落合成一段，段数对不上
+            return f"{self.lang}:" + text.replace(BATCH_SEPARATOR, " ")
+        return BATCH_SEPARATOR.join(f"{self.lang}:{p}" for p in text.split(BATCH_SEPARATOR))
+
+
+def test_second_run_only_sends_edited_paragraph(tmp_path: Path):
+    src_root = tmp_path / "zh"
+    dst_root = tmp_path / "i18n"
+    (src_root / "docs").mkdir(parents=True)
+    doc = src_root / "docs" / "guide.md"
+    doc.write_text("第一段\n\n第二段\n\n```\ncode\n```\n\n第三段\n", encoding="utf-8")
+
+    memory = TranslationMemory(tmp_path / "tm.db")
+    stubs = []
+
+    def factory(src, tgt):
+        stubs.append(StubTranslator(tgt))
+        return stubs[-1]
+
+    try:
+        assert run_bulk(src_root, dst_root, "zh-CN", [("en", "en")], factory, memory=memory, rate=0, workers=1) == (1, 0)
+        assert (dst_root / "en" / "docs" / "guide.md").read_text(encoding="utf-8") == (
+            "en:第一段\n\nen:第二段\n\n```\ncode\n```\n\nen:第三段\n"
+        )
+
+        doc.write_text("第一段\n\n第二段（已修改）\n\n```\ncode\n```\n\n第三段\n", encoding="utf-8")
+        stubs.clear()
+        assert run_bulk(
+            src_root, dst_root, "zh-CN", [("en", "en")], factory, memory=memory, overwrite=True, rate=0, workers=1
+        ) == (1, 0)
+    finally:
+        memory.close()
+
+    assert [call for stub in stubs for call in stub.calls] == ["第二段（已修改）"]
+    assert (dst_root / "en" / "docs" / "guide.md").read_text(encoding="utf-8") == (
+        "en:第一段\n\nen:第二段（已修改）\n\n```\ncode\n```\n\nen:第三段\n"
+    )
+
+
+def test_batch_count_mismatch_falls_back_to_single_paragraphs():
+    translator = StubTranslator(merge_batches=True)
+
+    results, partial = translate_paragraphs(["甲", "乙", "丙"], translator)
+
+    assert results == {"甲": "en:甲", "乙": "en:乙", "丙": "en:丙"}
+    assert partial == []
+    assert translator.calls == [BATCH_SEPARATOR.join(["甲", "乙", "丙"]), "甲", "乙", "丙"]
+
+
+def test_line_fallback_is_not_written_to_memory(tmp_path: Path):
+    broken = "第一行\n第二行"
+    translator = StubTranslator(fail={broken, BATCH_SEPARATOR.join(["正常段落", broken]), "第二行"})
+    memory = TranslationMemory(tmp_path / "tm.db")
+    try:
+        text = translate_blocks(f"正常段落\n\n{broken}", translator, memory, "en")
+
+        # 按行兜底：能译的行用译文，失败的行保留原文
+        assert text == "en:正常段落\n\nen:第一行\n第二行"
+        assert memory.get_many(["正常段落", broken], "en") == {"正常段落": "en:正常段落"}
+    finally:
+        memory.close()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_convert.py
+
+Benchmark for convert_local.py on a synthetic workbook (default 10,000 rows x 10
+columns = 100k cells) mixing prompt rows, tool/social links, placeholders, a
+warning row and a wallet section. Reports the time spent reading sheets,
+classifying rows and running a full conversion twice; the second conversion
+should rewrite no prompt files.
+
+Usage:
+  python prompt-library/scripts/bench_convert.py [--rows 10000] [--cols 10]
+
+Dependencies: pandas, openpyxl
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from openpyxl import Workbook
+
+
+def load_converter():
+    script = Path(__file__).resolve().parent / "convert_local.py"
+    spec = importlib.util.spec_from_file_location("convert_local", str(script))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["convert_local"] = module
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
+
+
+def build_workbook(path: Path, rows: int, cols: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("bench")
+    for r in range(rows):
+        roll = rng.random()
+        if roll < 0.01:
+            row = ["https://example.com/tool", " tool description "]
+        elif roll < 0.015:
+            row = ["https://x.com/someone", "follow"]
+        elif roll < 0.02:
+            row = ["...", None]
+        else:
+            row = [
+                f"  Prompt {r}-{c}: you are an expert assistant. " + "detail " * rng.randint(1, 20)
+                if rng.random() < 0.7 else None
+                for c in range(cols)
+            ]
+        ws.append(row)
+    ws.append(["广告位招租"])
+    ws.append(["网络名称", "礼貌要饭地址"])
+    ws.append(["TRC20", "TXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX"])
+    ws.append(["ERC20", "0xXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX"])
+    wb.save(path)
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<28}{time.perf_counter() - start:8.2f}s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark convert_local.py on a synthetic workbook")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--cols", type=int, default=10)
+    args = parser.parse_args()
+
+    convert_local = load_converter()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        excel_path = tmp_path / "bench.xlsx"
+        timed(f"build {args.rows}x{args.cols} workbook", lambda: build_workbook(excel_path, args.rows, args.cols))
+
+        def make_converter():
+            return convert_local.ExcelPromptConverter(
+                project_root=tmp_path,
+                prompt_library_dir=tmp_path,
+                excel_path=excel_path,
+                output_root=tmp_path / "out",
+            )
+
+        converter = make_converter()
+
+        def read_first_sheet():
+            wb = convert_local.load_workbook(excel_path, read_only=True, data_only=True)
+            try:
+                return converter._read_sheet(wb.worksheets[0])
+            finally:
+                wb.close()
+
+        df = timed("read sheet (streaming)", read_first_sheet)
+        rows = timed("classify rows", lambda: converter._classify_rows(df))
+        kinds = {}
+        for rc in rows:
+            kinds[rc.kind] = kinds.get(rc.kind, 0) + 1
+        print(f"  {df.shape[0]} rows x {df.shape[1]} cols, kinds: {kinds}")
+
+        first = make_converter()
+        timed("convert (cold)", first.convert)
+        print(f"  prompt files written: {first.files_written}, unchanged: {first.files_unchanged}")
+
+        second = make_converter()
+        timed("convert (unchanged)", second.convert)
+        print(f"  prompt files written: {second.files_written}, unchanged: {second.files_unchanged}")
+
+
+if __name__ == "__main__":
+    main()
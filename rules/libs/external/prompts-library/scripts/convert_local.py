@@ -22,11 +22,18 @@ If no arguments are provided, it will:
 - resolve Excel path from config.source.excel_file relative to project root
 - default category to "prompt-category"
 
+Performance notes:
+- sheets are streamed row by row with openpyxl in read-only mode
+- rows are classified with vectorized string operations over whole columns
+- prompt files are rewritten only when their content hash changed
+  (hashes are tracked in prompts/.content_hashes.json)
+
 Dependencies: pandas, openpyxl, PyYAML
 """
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import re
 from dataclasses import dataclass
@@ -34,7 +41,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+from openpyxl import load_workbook
 
 try:
     import yaml  # type: ignore
@@ -49,6 +58,9 @@ class RowClassification:
     data: Dict
 
 
+PLACEHOLDERS = ["...", "….", "...."]
+
+
 class ExcelPromptConverter:
     def __init__(
         self,
@@ -91,6 +103,12 @@ class ExcelPromptConverter:
         self.total_cols = 0
         self.sheet_names_order: List[str] = []
 
+        # {path relative to prompts_dir: sha256} of prompt files written by previous runs
+        self.content_hashes_path = self.prompts_dir / ".content_hashes.json"
+        self.content_hashes: Dict[str, str] = {}
+        self.files_written = 0
+        self.files_unchanged = 0
+
     def _load_config(self, config_path: Optional[Path]) -> Dict:
         if config_path and config_path.exists() and yaml is not None:
             with config_path.open("r", encoding="utf-8") as f:
@@ -116,57 +134,121 @@ class ExcelPromptConverter:
                 return self._sanitize_filename(candidate)
         return "untitled"
 
-    def _read_excel_sheets(self) -> Dict[str, pd.DataFrame]:
-        # Read all sheets; if workbook has single sheet, still returns dict with one entry
-        sheets: Dict[str, pd.DataFrame] = pd.read_excel(self.excel_path, header=None, engine="openpyxl", sheet_name=None)  # type: ignore
-        normalized: Dict[str, pd.DataFrame] = {}
-        for sheet_name, df in sheets.items():
-            try:
-                df = df.map(lambda v: v.strip() if isinstance(v, str) else v)  # pandas >=2.1
-            except Exception:
-                df = df.applymap(lambda v: v.strip() if isinstance(v, str) else v)  # fallback
-            normalized[sheet_name] = df
-        # preserve order of sheets
-        self.sheet_names_order = list(normalized.keys())
-        # set global rows/cols to first sheet for summary; detailed per-sheet handled later
-        if normalized:
-            any_df = normalized[self.sheet_names_order[0]]
-            self.total_rows, self.total_cols = any_df.shape
-        return normalized
+    @staticmethod
+    def _read_sheet_rows(ws) -> List[list]:
+        """Stream one worksheet row by row, stripping strings as they are read.
+
+        Mirrors pandas.read_excel(header=None): whole-number floats become ints,
+        trailing empty cells and trailing empty rows are dropped, leading empty
+        rows are kept.
+        """
+        rows: List[list] = []
+        last_non_empty = 0
+        for values in ws.iter_rows(values_only=True):
+            row = [
+                v.strip() if isinstance(v, str) else int(v) if isinstance(v, float) and v.is_integer() else v
+                for v in values
+            ]
+            while row and row[-1] is None:
+                row.pop()
+            rows.append(row)
+            if row:
+                last_non_empty = len(rows)
+        return rows[:last_non_empty]
+
+    def _read_sheet(self, ws) -> pd.DataFrame:
+        rows = self._read_sheet_rows(ws)
+        width = max((len(r) for r in rows), default=0)
+        for r in rows:
+            r.extend([None] * (width - len(r)))
+        return pd.DataFrame(rows, columns=range(width), dtype=object)
+
+    @staticmethod
+    def _str_mask(col: pd.Series, op) -> np.ndarray:
+        """Apply a pandas string op to a whole column; non-string cells yield False."""
+        try:
+            accessor = col.str
+        except AttributeError:  # column holds no strings at all (e.g. only numbers)
+            return np.zeros(len(col), dtype=bool)
+        return op(accessor).eq(True).to_numpy()
+
+    @classmethod
+    def _row_masks(cls, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Compute per-cell/per-row features column by column with vectorized string ops."""
+        n_rows, n_cols = df.shape
+        non_empty = np.zeros((n_rows, n_cols), dtype=bool)
+        http = np.zeros((n_rows, n_cols), dtype=bool)
+        has_network = np.zeros(n_rows, dtype=bool)
+        has_wallet_label = np.zeros(n_rows, dtype=bool)
+        has_ad = np.zeros(n_rows, dtype=bool)
+        has_placeholder = np.zeros(n_rows, dtype=bool)
+
+        for c in range(n_cols):
+            col = df.iloc[:, c].astype(object)
+            filled = cls._str_mask(col, lambda s: s.strip().str.len().gt(0))
+            non_empty[:, c] = filled
+            http[:, c] = cls._str_mask(col, lambda s: s.startswith("http"))
+            has_network |= cls._str_mask(col, lambda s: s.contains("网络", regex=False))
+            has_wallet_label |= cls._str_mask(col, lambda s: s.contains("钱包|地址", regex=True))
+            has_ad |= cls._str_mask(col, lambda s: s.contains("广告位", regex=False))
+            has_placeholder |= col.isin(PLACEHOLDERS).to_numpy() & filled
+
+        return {
+            "non_empty": non_empty,
+            "http": http,
+            # description = first non-empty string that is not a URL
+            "desc": non_empty & ~http,
+            "wallet_header": has_network & has_wallet_label,
+            "warning": has_ad,
+            "placeholder": has_placeholder,
+        }
 
     def _classify_rows(self, df: pd.DataFrame) -> List[RowClassification]:
         classifications: List[RowClassification] = []
         wallet_mode = False
-
-        for r in range(df.shape[0]):
-            row_vals = [df.iloc[r, c] if c < df.shape[1] else None for c in range(df.shape[1])]
-            non_empty = [v for v in row_vals if isinstance(v, str) and v.strip()]
-            any_http = any(isinstance(v, str) and v.startswith("http") for v in row_vals)
-
-            if not non_empty:
+        if df.empty:
+            return classifications
+
+        values = df.to_numpy(dtype=object)
+        masks = self._row_masks(df)
+        non_empty = masks["non_empty"]
+        any_non_empty = non_empty.any(axis=1)
+        http = masks["http"]
+        any_http = http.any(axis=1)
+        first_http = http.argmax(axis=1)
+        desc = masks["desc"]
+        any_desc = desc.any(axis=1)
+        first_desc = desc.argmax(axis=1)
+        # wallet rows: both of the first two cells are non-empty strings
+        wallet_pair = (
+            non_empty[:, 0] & non_empty[:, 1]
+            if values.shape[1] > 1
+            else np.zeros(values.shape[0], dtype=bool)
+        )
+
+        for r in range(values.shape[0]):
+            if not any_non_empty[r]:
                 classifications.append(RowClassification(r, "other", {"empty": True}))
                 continue
 
+            row_vals = values[r].tolist()
+
             # Wallet header detection (e.g., contains "网络" and a label like "礼貌要饭地址")
-            joined = " ".join([v for v in non_empty])
-            if any(k in joined for k in ["网络", "网络名称"]) and any(
-                k in joined for k in ["礼貌要饭地址", "钱包", "地址"]
-            ):
+            if masks["wallet_header"][r]:
                 wallet_mode = True
                 classifications.append(RowClassification(r, "wallet_header", {"raw": row_vals}))
                 continue
 
             if wallet_mode:
                 # If the row still looks like wallet data (two columns: network, address)
-                first, second = row_vals[0] if len(row_vals) > 0 else None, row_vals[1] if len(row_vals) > 1 else None
-                if (first and isinstance(first, str)) and (second and isinstance(second, str)):
+                if wallet_pair[r]:
                     classifications.append(
                         RowClassification(
                             r,
                             "wallet",
                             {
-                                "network": first,
-                                "address": second,
+                                "network": row_vals[0],
+                                "address": row_vals[1],
                                 "raw": row_vals,
                             },
                         )
@@ -176,37 +258,29 @@ class ExcelPromptConverter:
                     wallet_mode = False  # end wallet section if pattern breaks
 
             # Tools and social heuristics
-            if any_http:
-                url = next(v for v in row_vals if isinstance(v, str) and v.startswith("http"))
-                desc = None
-                for v in row_vals:
-                    if v and isinstance(v, str) and not v.startswith("http"):
-                        desc = v
-                        break
+            if any_http[r]:
+                url = row_vals[first_http[r]]
+                description = row_vals[first_desc[r]] if any_desc[r] else ""
                 kind = "social" if ("x.com" in url or "twitter.com" in url) else "tool"
-                classifications.append(RowClassification(r, kind, {"url": url, "description": desc or "", "raw": row_vals}))
+                classifications.append(RowClassification(r, kind, {"url": url, "description": description, "raw": row_vals}))
                 continue
 
             # Warnings or misc markers
-            if any("广告位" in v for v in non_empty if isinstance(v, str)):
+            if masks["warning"][r]:
+                joined = " ".join(row_vals[c] for c in np.flatnonzero(non_empty[r]))
                 classifications.append(RowClassification(r, "warning", {"content": joined, "raw": row_vals}))
                 continue
 
             # Placeholder rows to ignore as prompts
-            if any(v in {"...", "….", "...."} for v in non_empty):
+            if masks["placeholder"][r]:
                 classifications.append(RowClassification(r, "other", {"placeholder": True, "raw": row_vals}))
                 continue
 
             # Otherwise: treat as prompt row (one logical prompt per row with multiple versions across columns)
-            prompt_versions: Dict[int, str] = {}
-            for c in range(df.shape[1]):
-                cell = df.iloc[r, c] if c < df.shape[1] else None
-                if isinstance(cell, str) and cell.strip():
-                    prompt_versions[c + 1] = cell.strip()
-            if prompt_versions:
-                classifications.append(RowClassification(r, "prompt", {"versions": prompt_versions}))
-            else:
-                classifications.append(RowClassification(r, "other", {"raw": row_vals}))
+            prompt_versions: Dict[int, str] = {
+                int(c) + 1: row_vals[c].strip() for c in np.flatnonzero(non_empty[r])
+            }
+            classifications.append(RowClassification(r, "prompt", {"versions": prompt_versions}))
 
         return classifications
 
@@ -215,6 +289,27 @@ class ExcelPromptConverter:
         self.category_dir.mkdir(parents=True, exist_ok=True)
         self.docs_dir.mkdir(parents=True, exist_ok=True)
 
+    def _load_content_hashes(self) -> None:
+        if self.content_hashes_path.exists():
+            try:
+                self.content_hashes = json.loads(self.content_hashes_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self.content_hashes = {}
+
+    def _save_content_hashes(self) -> None:
+        self.content_hashes_path.write_text(json.dumps(self.content_hashes, ensure_ascii=False, indent=0), encoding="utf-8")
+
+    def _write_if_changed(self, filepath: Path, text: str) -> None:
+        """Write text unless the file already exists with the same content hash."""
+        key = filepath.relative_to(self.prompts_dir).as_posix()
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if self.content_hashes.get(key) == digest and filepath.exists():
+            self.files_unchanged += 1
+            return
+        filepath.write_text(text, encoding="utf-8")
+        self.content_hashes[key] = digest
+        self.files_written += 1
+
     def _write_prompt_file(self, row_num: int, col_num: int, title: str, content: str, versions_in_row: List[int]) -> str:
         """Write a prompt file containing ONLY the prompt text, nothing else."""
         row_col = f"({row_num},{col_num})"
@@ -222,7 +317,7 @@ class ExcelPromptConverter:
         filepath = self.category_dir / filename
         # Ensure content ends with newline and contains no surrounding fences/headers added by us
         pure = (content or "").rstrip("\n") + "\n"
-        filepath.write_text(pure, encoding="utf-8")
+        self._write_if_changed(filepath, pure)
         return filename
 
     def _generate_category_index(self, sheet_name: str, category_dir: Path, prompts_info: Dict[int, Dict]) -> None:
@@ -328,36 +423,41 @@ class ExcelPromptConverter:
         }
         index_json_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
 
-    def _generate_docs(self, sheets: Dict[str, pd.DataFrame]) -> None:
-        # docs/excel-data.md (full table)
-        excel_doc_path = self.docs_dir / "excel-data.md"
+    def _excel_doc_header(self, sheet_count: int) -> List[str]:
+        return [
+            "# 📊 Excel原始数据完整记录\n",
+            "## 数据来源\n",
+            f"- **文件**: {self.excel_path.name}\n",
+            f"- **处理时间**: {self.now.strftime('%Y-%m-%d')}\n",
+            f"- **工作表数量**: {sheet_count}\n\n",
+        ]
+
+    @staticmethod
+    def _fmt_cell(x) -> str:
+        try:
+            if x is None or (isinstance(x, float) and pd.isna(x)) or (hasattr(pd, 'isna') and pd.isna(x)):
+                return ""
+        except Exception:
+            pass
+        s = str(x)
+        return s.replace("|", "\\|")
+
+    def _excel_doc_section(self, sheet_name: str, df: pd.DataFrame) -> List[str]:
+        fmt = self._fmt_cell
+        rows, cols = df.shape
         lines: List[str] = []
-        lines.append("# 📊 Excel原始数据完整记录\n")
-        lines.append("## 数据来源\n")
-        lines.append(f"- **文件**: {self.excel_path.name}\n")
-        lines.append(f"- **处理时间**: {self.now.strftime('%Y-%m-%d')}\n")
-        lines.append(f"- **工作表数量**: {len(sheets)}\n\n")
-        for sheet_name, df in sheets.items():
-            rows, cols = df.shape
-            lines.append(f"## 工作表: {sheet_name} ({rows}行×{cols}列)\n")
-            lines.append("\n| 行号 | 列1 | 列2 | 列3 |\n|-----:|-----|-----|-----|\n")
-            for r in range(rows):
-                c1 = df.iloc[r, 0] if cols > 0 else ""
-                c2 = df.iloc[r, 1] if cols > 1 else ""
-                c3 = df.iloc[r, 2] if cols > 2 else ""
-                def fmt(x) -> str:
-                    try:
-                        if x is None or (isinstance(x, float) and pd.isna(x)) or (hasattr(pd, 'isna') and pd.isna(x)):
-                            return ""
-                    except Exception:
-                        pass
-                    s = str(x)
-                    return s.replace("|", "\\|")
-                lines.append(f"| {r} | {fmt(c1)} | {fmt(c2)} | {fmt(c3)} |\n")
-            lines.append("\n")
-        lines.append("\n---\n*完整数据提取自 {0}*\n".format(self.excel_path.name))
-        excel_doc_path.write_text("\n".join(lines), encoding="utf-8")
-
+        lines.append(f"## 工作表: {sheet_name} ({rows}行×{cols}列)\n")
+        lines.append("\n| 行号 | 列1 | 列2 | 列3 |\n|-----:|-----|-----|-----|\n")
+        for r in range(rows):
+            c1 = df.iloc[r, 0] if cols > 0 else ""
+            c2 = df.iloc[r, 1] if cols > 1 else ""
+            c3 = df.iloc[r, 2] if cols > 2 else ""
+            lines.append(f"| {r} | {fmt(c1)} | {fmt(c2)} | {fmt(c3)} |\n")
+        lines.append("\n")
+        return lines
+
+    def _generate_docs(self) -> None:
+        # docs/excel-data.md is written sheet by sheet in convert()
         # docs/tools.md
         tools_path = self.docs_dir / "tools.md"
         t_lines: List[str] = []
@@ -426,72 +526,99 @@ class ExcelPromptConverter:
         readme.append("\n---\n*完全基于 Excel 表格自动生成*\n")
         readme_path.write_text("\n".join(readme), encoding="utf-8")
 
-    def convert(self) -> None:
-        self._ensure_dirs()
-        sheets = self._read_excel_sheets()
-        # If no sheets returned (shouldn't happen), fallback to empty
-        for idx, sheet_name in enumerate(self.sheet_names_order, start=1):
-            df = sheets[sheet_name]
-            # Prepare per-sheet folder
-            folder_name = f"({idx})_{self._sanitize_filename(sheet_name)}"
-            category_dir = self.prompts_dir / folder_name
-            category_dir.mkdir(parents=True, exist_ok=True)
-
-            # Classify rows
-            rows = self._classify_rows(df)
-            prompts_info: Dict[int, Dict] = {}
-
-            # Build prompt files for this sheet
-            for rc in rows:
-                if rc.kind == "prompt":
-                    excel_row_number = rc.row_index + 1
-                    versions: Dict[int, str] = rc.data["versions"]
-                    title = self._extract_title(list(versions.values()))
-                    prompts_info[excel_row_number] = {"title": title, "versions": {}}
-                    # Rewrite files directly into category_dir
-                    for col_num, content in versions.items():
-                        row_col = f"({excel_row_number},{col_num})"
-                        filename = f"{row_col}_{title}.md"
-                        (category_dir / filename).write_text((content or "").rstrip("\n") + "\n", encoding="utf-8")
-                        prompts_info[excel_row_number]["versions"][col_num] = filename
-                elif rc.kind == "tool":
-                    url = rc.data.get("url", "")
-                    self.tools.append({
-                        "name": "OpenAI 提示词优化平台" if "openai" in url else "工具",
-                        "url": url,
-                        "description": rc.data.get("description", ""),
+    def _convert_sheet(self, idx: int, sheet_name: str, df: pd.DataFrame) -> None:
+        # Prepare per-sheet folder
+        folder_name = f"({idx})_{self._sanitize_filename(sheet_name)}"
+        category_dir = self.prompts_dir / folder_name
+        category_dir.mkdir(parents=True, exist_ok=True)
+
+        # Classify rows
+        rows = self._classify_rows(df)
+        prompts_info: Dict[int, Dict] = {}
+
+        # Build prompt files for this sheet
+        for rc in rows:
+            if rc.kind == "prompt":
+                excel_row_number = rc.row_index + 1
+                versions: Dict[int, str] = rc.data["versions"]
+                title = self._extract_title(list(versions.values()))
+                prompts_info[excel_row_number] = {"title": title, "versions": {}}
+                # Rewrite files directly into category_dir
+                for col_num, content in versions.items():
+                    row_col = f"({excel_row_number},{col_num})"
+                    filename = f"{row_col}_{title}.md"
+                    self._write_if_changed(category_dir / filename, (content or "").rstrip("\n") + "\n")
+                    prompts_info[excel_row_number]["versions"][col_num] = filename
+            elif rc.kind == "tool":
+                url = rc.data.get("url", "")
+                self.tools.append({
+                    "name": "OpenAI 提示词优化平台" if "openai" in url else "工具",
+                    "url": url,
+                    "description": rc.data.get("description", ""),
+                    "excel_row": rc.row_index,
+                    "sheet": sheet_name,
+                })
+            elif rc.kind == "social":
+                url = rc.data.get("url", "")
+                name = "Twitter/X 账号" if ("x.com" in url or "twitter.com" in url) else "社交账号"
+                self.social.append({
+                    "name": name,
+                    "url": url,
+                    "description": rc.data.get("description", ""),
+                    "excel_row": rc.row_index,
+                    "sheet": sheet_name,
+                })
+            elif rc.kind == "wallet":
+                network = str(rc.data.get("network", "")).strip()
+                address = str(rc.data.get("address", "")).strip()
+                if network and address:
+                    self.wallets[network.lower()] = {
+                        "address": address,
                         "excel_row": rc.row_index,
                         "sheet": sheet_name,
-                    })
-                elif rc.kind == "social":
-                    url = rc.data.get("url", "")
-                    name = "Twitter/X 账号" if ("x.com" in url or "twitter.com" in url) else "社交账号"
-                    self.social.append({
-                        "name": name,
-                        "url": url,
-                        "description": rc.data.get("description", ""),
-                        "excel_row": rc.row_index,
-                        "sheet": sheet_name,
-                    })
-                elif rc.kind == "wallet":
-                    network = str(rc.data.get("network", "")).strip()
-                    address = str(rc.data.get("address", "")).strip()
-                    if network and address:
-                        self.wallets[network.lower()] = {
-                            "address": address,
-                            "excel_row": rc.row_index,
-                            "sheet": sheet_name,
-                        }
-                elif rc.kind == "warning":
-                    self.misc.append({"type": "warning", "excel_row": rc.row_index, "content": rc.data.get("content", ""), "sheet": sheet_name})
+                    }
+            elif rc.kind == "warning":
+                self.misc.append({"type": "warning", "excel_row": rc.row_index, "content": rc.data.get("content", ""), "sheet": sheet_name})
 
-            # Save per-sheet prompts map and index
-            self.prompts_info_by_sheet[sheet_name] = prompts_info
-            self._generate_category_index(sheet_name, category_dir, prompts_info)
+        # Save per-sheet prompts map and index
+        self.prompts_info_by_sheet[sheet_name] = prompts_info
+        self._generate_category_index(sheet_name, category_dir, prompts_info)
+
+
+    def convert(self) -> None:
+        """Convert the workbook one sheet at a time.
+
+        Each sheet is streamed, classified, written out and appended to
+        docs/excel-data.md before the next one is read, so only one sheet's
+        DataFrame is held in memory.
+        """
+        self._ensure_dirs()
+        self._load_content_hashes()
+        wb = load_workbook(self.excel_path, read_only=True, data_only=True)
+        try:
+            worksheets = wb.worksheets
+            # preserve order of sheets
+            self.sheet_names_order = [ws.title for ws in worksheets]
+            excel_doc_path = self.docs_dir / "excel-data.md"
+            with excel_doc_path.open("w", encoding="utf-8") as excel_doc:
+                excel_doc.write("\n".join(self._excel_doc_header(len(worksheets))))
+                for idx, ws in enumerate(worksheets, start=1):
+                    df = self._read_sheet(ws)
+                    if idx == 1:
+                        # global rows/cols follow the first sheet for the summary
+                        self.total_rows, self.total_cols = df.shape
+                    self._convert_sheet(idx, ws.title, df)
+                    excel_doc.write("\n" + "\n".join(self._excel_doc_section(ws.title, df)))
+                    del df
+                excel_doc.write("\n" + "\n---\n*完整数据提取自 {0}*\n".format(self.excel_path.name))
+        finally:
+            wb.close()
+
+        self._save_content_hashes()
 
         # Global indices and docs
         self._generate_prompts_index_json()
-        self._generate_docs(sheets)
+        self._generate_docs()
         self._generate_readme()
 
 
@@ -543,6 +670,7 @@ def main() -> None:
     converter.convert()
     target = out_dir if out_dir else prompt_library_dir
     print(f"✅ Conversion complete. Output under: {target}")
+    print(f"   Prompt files written: {converter.files_written}, unchanged: {converter.files_unchanged}")
 
 
 if __name__ == "__main__":
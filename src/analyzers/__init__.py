@@ -6,5 +6,10 @@
 - 资金分析: 主力净流入
 - 量价分析: 量比, 换手率
 - 信号检测: 综合信号判断
+- 龙虎榜: 席位倒排索引 + 游资追踪
 """
 
+from .dragon_tiger import DragonTigerStore
+from .technical import calc_boll, calc_macd
+
+__all__ = ["calc_macd", "calc_boll", "DragonTigerStore"]
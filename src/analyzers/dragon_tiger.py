@@ -0,0 +1,259 @@
+"""
+龙虎榜席位分析
+
+按日增量存储龙虎榜明细，并维护两个倒排索引:
+- 席位 → 上榜记录（日期、股票、净买额）: 某席位近 N 日买了哪些股票
+- 股票 → 上榜记录: 某股票近 N 日出现了哪些（游资）席位
+
+存储设计:
+- 席位名、股票代码驻留为整数 id，记录按列存放在 array 中，内存紧凑
+- 记录按交易日顺序追加，倒排表中的记录号天然有序，窗口起点用二分定位，
+  查询耗时只与窗口内命中的记录数相关，与历史长度无关
+- 可选 SQLite 持久化，启动时一次性重建索引；无记录的交易日同样入库，
+  重启前后的 N 日窗口一致
+"""
+
+import sqlite3
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+class DragonTigerStore:
+    """龙虎榜明细存储与席位查询"""
+
+    def __init__(self, db_path: Optional[Path] = None, hot_money: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            db_path: SQLite 文件路径，为 None 时仅保存在内存
+            hot_money: {席位全称: 游资别名}，如 {"华鑫证券上海分公司": "炒股养家"}
+        """
+        self._seat_names: List[str] = []
+        self._seat_ids: Dict[str, int] = {}
+        self._codes: List[str] = []
+        self._code_ids: Dict[str, int] = {}
+
+        # 按列存储的上榜记录
+        self._rec_day = array("l")    # 交易日序号（_days 下标）
+        self._rec_code = array("l")
+        self._rec_seat = array("l")
+        self._rec_net = array("d")    # 净买额 = 买入 - 卖出
+
+        # 已入库交易日（ordinal，严格递增）及每日首条记录号
+        self._days = array("l")
+        self._day_start = array("l")
+
+        self._by_seat: Dict[int, array] = {}
+        self._by_code: Dict[int, array] = {}
+
+        self.hot_money = dict(hot_money or {})
+
+        self._conn = None
+        if db_path is not None:
+            self._conn = sqlite3.connect(str(db_path))
+            self._init_db()
+            self._load()
+
+    # ==================== 驻留 ====================
+
+    def _intern_code(self, code: str) -> int:
+        code_id = self._code_ids.get(code)
+        if code_id is None:
+            code_id = len(self._codes)
+            self._code_ids[code] = code_id
+            self._codes.append(code)
+        return code_id
+
+    # ==================== 持久化 ====================
+
+    def _init_db(self) -> None:
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS seats (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);
+            CREATE TABLE IF NOT EXISTS days (day INTEGER PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS records (
+                day INTEGER NOT NULL,
+                code TEXT NOT NULL,
+                seat_id INTEGER NOT NULL,
+                net REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_records_day ON records (day);
+            """
+        )
+        # 兼容没有 days 表时写入的旧库
+        with self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO days (day) SELECT DISTINCT day FROM records")
+
+    def _load(self) -> None:
+        for seat_id, name in self._conn.execute("SELECT id, name FROM seats ORDER BY id"):
+            self._seat_ids[name] = seat_id
+            self._seat_names.append(name)
+        days = [day for (day,) in self._conn.execute("SELECT day FROM days ORDER BY day")]
+        next_day = 0
+        for day, code, seat_id, net in self._conn.execute(
+            "SELECT day, code, seat_id, net FROM records ORDER BY day, rowid"
+        ):
+            # 依次登记截至该记录日期的交易日（含无记录的交易日）
+            while next_day < len(days) and days[next_day] <= day:
+                self._days.append(days[next_day])
+                self._day_start.append(len(self._rec_day))
+                next_day += 1
+            self._append(len(self._days) - 1, self._intern_code(code), seat_id, net)
+        for day in days[next_day:]:
+            self._days.append(day)
+            self._day_start.append(len(self._rec_day))
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ==================== 写入 ====================
+
+    def _append(self, day_idx: int, code_id: int, seat_id: int, net: float) -> None:
+        rec_id = len(self._rec_day)
+        self._rec_day.append(day_idx)
+        self._rec_code.append(code_id)
+        self._rec_seat.append(seat_id)
+        self._rec_net.append(net)
+        self._by_seat.setdefault(seat_id, array("l")).append(rec_id)
+        self._by_code.setdefault(code_id, array("l")).append(rec_id)
+
+    def add_day(self, trade_date: date, records: Iterable[dict]) -> int:
+        """
+        追加一个交易日的龙虎榜明细
+
+        Args:
+            trade_date: 交易日，必须晚于已入库的最后一天；已入库的日期直接跳过
+            records: [{"code", "seat", "buy", "sell"}, ...]，金额单位为元
+
+        Returns:
+            新增记录数
+
+        Raises:
+            ValueError: 日期早于已入库的最后一天，或记录缺字段/金额无法转换；
+                此时不写入任何数据，修正后可用同一日期重试
+        """
+        day = trade_date.toordinal()
+        if self._days and day <= self._days[-1]:
+            idx = bisect_left(self._days, day)
+            if self._days[idx] == day:
+                return 0
+            raise ValueError(f"龙虎榜需按日期顺序追加: {trade_date} 早于已入库的最后一天")
+
+        # 先校验并转换全部记录，新席位只预分配 id，不改动任何状态
+        rows = []
+        new_seats: Dict[str, int] = {}
+        for item in records:
+            try:
+                code = str(item["code"])
+                seat = str(item["seat"])
+                net = float(item.get("buy") or 0) - float(item.get("sell") or 0)
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{trade_date} 龙虎榜记录无效: {item!r}") from e
+            seat_id = self._seat_ids.get(seat)
+            if seat_id is None:
+                seat_id = new_seats.setdefault(seat, len(self._seat_names) + len(new_seats))
+            rows.append((day, code, seat_id, net))
+
+        # 交易日、席位与记录在同一事务中落库，失败则整体回滚
+        if self._conn is not None:
+            with self._conn:
+                self._conn.execute("INSERT INTO days (day) VALUES (?)", (day,))
+                self._conn.executemany(
+                    "INSERT INTO seats (id, name) VALUES (?, ?)",
+                    [(seat_id, name) for name, seat_id in new_seats.items()],
+                )
+                self._conn.executemany("INSERT INTO records (day, code, seat_id, net) VALUES (?, ?, ?, ?)", rows)
+
+        for name, seat_id in new_seats.items():
+            self._seat_ids[name] = seat_id
+            self._seat_names.append(name)
+        day_idx = len(self._days)
+        self._days.append(day)
+        self._day_start.append(len(self._rec_day))
+        for _, code, seat_id, net in rows:
+            self._append(day_idx, self._intern_code(code), seat_id, net)
+        return len(rows)
+
+    # ==================== 查询 ====================
+
+    def _window(self, days: int, end: Optional[date]) -> Optional[tuple]:
+        """返回最近 days 个交易日（截至 end）对应的记录号区间 [lo, hi)"""
+        if not self._days:
+            return None
+        end_idx = len(self._days) if end is None else bisect_right(self._days, end.toordinal())
+        if end_idx == 0:
+            return None
+        start_idx = max(end_idx - days, 0)
+        lo = self._day_start[start_idx]
+        hi = self._day_start[end_idx] if end_idx < len(self._days) else len(self._rec_day)
+        return lo, hi
+
+    @staticmethod
+    def _slice(postings, lo: int, hi: int):
+        return postings[bisect_left(postings, lo):bisect_left(postings, hi)]
+
+    def seat_activity(self, seat: str, days: int = 20, end: Optional[date] = None) -> List[dict]:
+        """
+        某席位近 days 个交易日的上榜记录
+
+        Returns:
+            [{"date", "code", "net"}, ...]，按日期升序
+        """
+        seat_id = self._seat_ids.get(seat)
+        window = self._window(days, end)
+        if seat_id is None or window is None:
+            return []
+        return [
+            {
+                "date": date.fromordinal(self._days[self._rec_day[r]]),
+                "code": self._codes[self._rec_code[r]],
+                "net": self._rec_net[r],
+            }
+            for r in self._slice(self._by_seat.get(seat_id, ()), *window)
+        ]
+
+    def seat_net_by_code(self, seat: str, days: int = 20, end: Optional[date] = None) -> Dict[str, float]:
+        """某席位近 days 个交易日按股票汇总的净买额，按净买额降序"""
+        totals: Dict[str, float] = {}
+        for rec in self.seat_activity(seat, days, end):
+            totals[rec["code"]] = totals.get(rec["code"], 0.0) + rec["net"]
+        return dict(sorted(totals.items(), key=lambda kv: kv[1], reverse=True))
+
+    def code_seats(
+        self,
+        code: str,
+        days: int = 20,
+        end: Optional[date] = None,
+        hot_money_only: bool = False,
+    ) -> Dict[str, float]:
+        """
+        某股票近 days 个交易日出现的席位及其累计净买额
+
+        Args:
+            hot_money_only: 只返回 hot_money 中登记的游资席位
+
+        Returns:
+            {席位名: 净买额}，按净买额降序
+        """
+        code_id = self._code_ids.get(code)
+        window = self._window(days, end)
+        if code_id is None or window is None:
+            return {}
+        totals: Dict[str, float] = {}
+        for r in self._slice(self._by_code.get(code_id, ()), *window):
+            name = self._seat_names[self._rec_seat[r]]
+            if hot_money_only and name not in self.hot_money:
+                continue
+            totals[name] = totals.get(name, 0.0) + self._rec_net[r]
+        return dict(sorted(totals.items(), key=lambda kv: kv[1], reverse=True))
+
+    def __len__(self) -> int:
+        return len(self._rec_day)
+
+    @property
+    def seat_count(self) -> int:
+        return len(self._seat_names)
@@ -0,0 +1,38 @@
+"""
+技术指标计算
+
+纯 pandas 实现，参数与 config/indicators.yaml 中的 technical 段一一对应
+"""
+
+import pandas as pd
+
+
+def calc_macd(
+    close: pd.Series,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+) -> pd.DataFrame:
+    """
+    计算 MACD
+
+    Returns:
+        DataFrame[dif, dea, hist]，hist 采用国内惯例 2 * (dif - dea)
+    """
+    ema_fast = close.ewm(span=fast, adjust=False).mean()
+    ema_slow = close.ewm(span=slow, adjust=False).mean()
+    dif = ema_fast - ema_slow
+    dea = dif.ewm(span=signal, adjust=False).mean()
+    return pd.DataFrame({"dif": dif, "dea": dea, "hist": 2 * (dif - dea)})
+
+
+def calc_boll(close: pd.Series, period: int = 20, std: float = 2) -> pd.DataFrame:
+    """
+    计算布林带
+
+    Returns:
+        DataFrame[mid, upper, lower]，前 period-1 根为 NaN
+    """
+    mid = close.rolling(period).mean()
+    width = close.rolling(period).std(ddof=0) * std
+    return pd.DataFrame({"mid": mid, "upper": mid + width, "lower": mid - width})
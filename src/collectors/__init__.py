@@ -7,9 +7,11 @@
 - 外盘数据
 - 期货数据
 - 板块数据
+- 新闻/政策（增量 + 去重）
 """
 
 from .base import BaseCollector
+from .news_collector import NewsCollector
 
-__all__ = ["BaseCollector"]
+__all__ = ["BaseCollector", "NewsCollector"]
 
@@ -0,0 +1,159 @@
+"""
+新闻/政策采集器
+
+增量采集多个资讯源:
+- 每个源维护高水位（已采集到的最新发布时间），只处理更新的条目
+- SimHash 近似去重，指纹索引跨运行持久化，同一事件的多源转载只保留首条
+- Aho-Corasick 自动机按股票名称/代码给新闻打上自选股标签
+
+collect() 只返回本次新增且不重复的条目，可直接交给 TLDR 生成；
+高水位与指纹在调用方确认交接成功后通过 commit() 提交并持久化，
+交接失败时不提交，下次运行会重新采集这批条目
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.utils.text_match import AhoCorasick, SimHashIndex, simhash
+
+from .base import BaseCollector
+
+# 资讯源：接收高水位（ISO 时间字符串，首次为 None），返回
+# [{"title", "content", "published_at", "url"}, ...]
+NewsSource = Callable[[Optional[str]], List[dict]]
+
+NEWS_COLUMNS = ["source", "published_at", "title", "content", "url", "codes"]
+
+
+class NewsCollector(BaseCollector):
+    """增量新闻采集器"""
+
+    def __init__(
+        self,
+        sources: Dict[str, NewsSource],
+        watchlist: List[dict],
+        state_path: Path = Path("data/news_state.json"),
+        max_distance: int = 3,
+        retention_days: int = 30,
+    ):
+        """
+        Args:
+            sources: {源名称: 资讯源函数}
+            watchlist: 自选股列表，格式同 watchlist.yaml
+            state_path: 高水位与指纹索引的持久化文件
+            max_distance: SimHash 汉明距离阈值，不超过即视为重复
+            retention_days: 指纹保留天数
+        """
+        super().__init__("news")
+        self.sources = sources
+        self.state_path = Path(state_path)
+        self.retention_days = retention_days
+        self.matcher = self._build_matcher(watchlist)
+
+        state = self._load_state()
+        self.high_water: Dict[str, str] = state.get("high_water", {})
+        self.index = SimHashIndex.from_list(state.get("simhashes", []), max_distance=max_distance)
+        # collect() 产生、尚未 commit() 的 (高水位, 指纹索引)
+        self._pending: Optional[Tuple[Dict[str, str], SimHashIndex]] = None
+
+    @staticmethod
+    def _build_matcher(watchlist: List[dict]) -> AhoCorasick:
+        patterns = {}
+        for item in watchlist:
+            code = str(item["code"])
+            patterns[code] = code
+            if item.get("name"):
+                patterns[item["name"]] = code
+        return AhoCorasick(patterns)
+
+    def _load_state(self) -> dict:
+        if not self.state_path.exists():
+            return {}
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_state(self) -> None:
+        """持久化高水位与指纹索引（先写临时文件再替换，避免中断导致损坏）"""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"high_water": self.high_water, "simhashes": self.index.to_list()},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, self.state_path)
+
+    def commit(self) -> None:
+        """确认上一次 collect() 的结果已交接成功：提交高水位与指纹并持久化"""
+        if self._pending is None:
+            return
+        self.high_water, self.index = self._pending
+        self._pending = None
+        self.save_state()
+
+    def tag_codes(self, text: str) -> List[str]:
+        """找出文本中提及的自选股代码，按首次出现顺序返回"""
+        codes = []
+        for start, pattern, code in self.matcher.iter_matches(text):
+            # 纯数字代码需独立出现，避免命中更长数字串（如金额、其他代码）的一部分
+            if pattern.isdigit():
+                end = start + len(pattern)
+                if (start > 0 and text[start - 1].isdigit()) or (end < len(text) and text[end].isdigit()):
+                    continue
+            if code not in codes:
+                codes.append(code)
+        return codes
+
+    def collect(self) -> pd.DataFrame:
+        """
+        采集各源的新增条目，去重打标后返回
+
+        高水位与指纹只在副本上推进，调用方交接成功后需调用 commit()；
+        未提交时再次 collect() 会从上次提交的状态重新开始
+        """
+        now = time.time()
+        high_water = dict(self.high_water)
+        index = SimHashIndex.from_list(self.index.to_list(), max_distance=self.index.max_distance)
+        index.prune(now - self.retention_days * 86400)
+
+        rows = []
+        for source, fetch in self.sources.items():
+            mark = high_water.get(source)
+            try:
+                items = fetch(mark)
+            except Exception as e:
+                print(f"⚠️ 资讯源 {source} 采集失败: {e}")
+                continue
+
+            for item in sorted(items, key=lambda x: str(x.get("published_at", ""))):
+                published_at = str(item.get("published_at", ""))
+                # 与高水位相同时间的条目仍交给指纹索引判断，避免同一秒内的新条目被漏掉
+                if mark and published_at < mark:
+                    continue
+                if not high_water.get(source) or published_at > high_water[source]:
+                    high_water[source] = published_at
+
+                title = item.get("title", "")
+                content = item.get("content", "")
+                fingerprint = simhash(f"{title} {content}")
+                if index.find(fingerprint) is not None:
+                    continue
+                index.add(fingerprint, now)
+
+                rows.append({
+                    "source": source,
+                    "published_at": published_at,
+                    "title": title,
+                    "content": content,
+                    "url": item.get("url", ""),
+                    "codes": self.tag_codes(f"{title} {content}"),
+                })
+
+        self._pending = (high_water, index)
+        return pd.DataFrame(rows, columns=NEWS_COLUMNS)
@@ -5,5 +5,10 @@
 - Jinja2 模板渲染
 - PDF 导出
 - 报告构建器
+- K 线图渲染
 """
 
+from .charts import ChartRenderer
+
+__all__ = ["ChartRenderer"]
+
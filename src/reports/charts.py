@@ -0,0 +1,316 @@
+"""
+K 线图渲染
+
+为自选股生成 K线 + 成交量 + MACD/BOLL 组合图，嵌入 HTML/PDF 报告:
+- 多进程并行渲染（matplotlib 非线程安全，且 CPU 密集）
+- 按 K 线数据 + 指标参数 + 标题/尺寸的内容哈希缓存，数据未变的图不重绘
+- 指标基于完整历史计算后再截取最近 lookback 根，与分析结果一致
+- 输出调色板 PNG，适合嵌入 PDF
+- 整体渲染有时间预算，超时的图直接跳过，报告退化为纯文字卡片
+- 缓存目录按保留天数清理，本次未用到且过期的图片会被删除
+"""
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+# 参与绘图的列，哈希也只基于这些列
+BAR_COLUMNS = ["date", "open", "high", "low", "close", "volume"]
+
+# 图形样式变更时递增，使旧缓存自然失效
+CHART_STYLE_VERSION = 2
+
+# 标题含中文股票名称，按顺序回退到系统中可用的中文字体
+CJK_FONTS = ["Noto Sans CJK SC", "Source Han Sans SC", "SimHei", "Microsoft YaHei", "PingFang SC",
+             "WenQuanYi Micro Hei", "DejaVu Sans"]
+
+DEFAULT_INDICATORS = {
+    "macd": {"fast": 12, "slow": 26, "signal": 9},
+    "boll": {"period": 20, "std": 2},
+}
+
+
+def chart_cache_key(
+    bars: pd.DataFrame,
+    indicators: dict,
+    lookback: int,
+    title: str = "",
+    width_px: int = 900,
+    height_px: int = 600,
+    colors: int = 64,
+) -> str:
+    """
+    计算图表缓存键：K 线内容 + 指标参数 + 标题 + 输出尺寸 + 样式版本
+
+    指标依赖完整历史（EMA 需要预热），因此哈希覆盖全部 K 线而不只是绘制区间
+    """
+    digest = hashlib.sha256()
+    frame = bars[BAR_COLUMNS].reset_index(drop=True)
+    digest.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+    meta = {
+        "indicators": indicators,
+        "lookback": lookback,
+        "title": title,
+        "size": [width_px, height_px],
+        "colors": colors,
+        "style": CHART_STYLE_VERSION,
+    }
+    digest.update(json.dumps(meta, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def chart_frame(bars: pd.DataFrame, indicators: dict, lookback: int) -> pd.DataFrame:
+    """
+    在完整历史上计算 MACD/BOLL，再截取最近 lookback 根用于绘图
+
+    Returns:
+        DataFrame[date, open, high, low, close, volume, dif, dea, hist, mid, upper, lower]
+    """
+    from src.analyzers.technical import calc_boll, calc_macd
+
+    frame = bars[BAR_COLUMNS].reset_index(drop=True)
+    macd = calc_macd(frame["close"], **indicators["macd"])
+    boll = calc_boll(frame["close"], **indicators["boll"])
+    frame = pd.concat([frame, macd, boll], axis=1)
+    return frame.tail(lookback).reset_index(drop=True)
+
+
+def chart_data_uri(path: Path) -> str:
+    """将图片转为 data URI，供 Jinja2 模板直接内嵌"""
+    encoded = base64.b64encode(Path(path).read_bytes()).decode("ascii")
+    return f"data:image/png;base64,{encoded}"
+
+
+def _render_chart(
+    bars: pd.DataFrame,
+    title: str,
+    indicators: dict,
+    lookback: int,
+    out_path: str,
+    width_px: int,
+    height_px: int,
+    colors: int,
+) -> str:
+    """
+    子进程内渲染单张图表
+
+    必须是模块级函数，以便 ProcessPoolExecutor 序列化
+    """
+    import io
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    matplotlib.rcParams["font.sans-serif"] = CJK_FONTS
+    matplotlib.rcParams["font.family"] = "sans-serif"
+    # 中文字体多数不含 Unicode 负号，改用 ASCII 连字符
+    matplotlib.rcParams["axes.unicode_minus"] = False
+    import matplotlib.pyplot as plt
+    import numpy as np
+    from PIL import Image
+
+    bars = chart_frame(bars, indicators, lookback)
+    macd = bars[["dif", "dea", "hist"]]
+    boll = bars[["mid", "upper", "lower"]]
+
+    x = np.arange(len(bars))
+    up = (bars["close"] >= bars["open"]).to_numpy()
+    # A 股惯例：红涨绿跌
+    bar_colors = np.where(up, "#d62728", "#2ca02c")
+
+    dpi = 100
+    fig, (ax_price, ax_vol, ax_macd) = plt.subplots(
+        3, 1,
+        figsize=(width_px / dpi, height_px / dpi),
+        dpi=dpi,
+        sharex=True,
+        gridspec_kw={"height_ratios": [3, 1, 1], "hspace": 0.05},
+    )
+
+    # K 线：影线 + 实体
+    ax_price.vlines(x, bars["low"], bars["high"], colors=bar_colors, linewidth=0.8)
+    body_low = np.minimum(bars["open"], bars["close"])
+    body_height = np.maximum((bars["close"] - bars["open"]).abs(), 1e-6)
+    ax_price.bar(x, body_height, bottom=body_low, width=0.6, color=bar_colors)
+    ax_price.plot(x, boll["mid"], color="#ff7f0e", linewidth=0.8)
+    ax_price.plot(x, boll["upper"], color="#1f77b4", linewidth=0.8)
+    ax_price.plot(x, boll["lower"], color="#1f77b4", linewidth=0.8)
+    ax_price.set_title(title, fontsize=9, loc="left")
+
+    ax_vol.bar(x, bars["volume"], width=0.6, color=bar_colors)
+
+    hist_colors = np.where(macd["hist"] >= 0, "#d62728", "#2ca02c")
+    ax_macd.bar(x, macd["hist"], width=0.6, color=hist_colors)
+    ax_macd.plot(x, macd["dif"], color="#333333", linewidth=0.8)
+    ax_macd.plot(x, macd["dea"], color="#ff7f0e", linewidth=0.8)
+
+    dates = pd.to_datetime(bars["date"]).dt.strftime("%m-%d").tolist()
+    step = max(len(x) // 6, 1)
+    ax_macd.set_xticks(x[::step])
+    ax_macd.set_xticklabels(dates[::step], fontsize=7)
+    for ax in (ax_price, ax_vol, ax_macd):
+        ax.tick_params(axis="y", labelsize=7)
+        ax.grid(alpha=0.2)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    plt.close(fig)
+
+    # 图表以纯色为主，量化为调色板 PNG 后体积通常缩小 3-5 倍
+    buffer.seek(0)
+    image = Image.open(buffer).convert("RGB").quantize(colors=colors)
+    # 临时文件名唯一，避免并发写同一目标时互相覆盖
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(out_path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            image.save(f, format="PNG", optimize=True)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return out_path
+
+
+class ChartRenderer:
+    """自选股图表渲染器"""
+
+    def __init__(
+        self,
+        cache_dir: Path = Path("output/charts"),
+        indicators: Optional[dict] = None,
+        lookback: int = 120,
+        max_workers: Optional[int] = None,
+        time_budget: float = 30.0,
+        width_px: int = 900,
+        height_px: int = 600,
+        colors: int = 64,
+        cache_days: int = 7,
+    ):
+        """
+        Args:
+            cache_dir: 图片缓存目录，文件名即内容哈希
+            indicators: MACD/BOLL 参数，结构同 indicators.yaml 的 technical 段
+            lookback: 绘制最近多少根 K 线
+            max_workers: 进程数，默认 CPU 核数
+            time_budget: 全部图表的渲染时间上限（秒）
+            colors: PNG 调色板颜色数
+            cache_days: 缓存保留天数，本次未用到且超过该天数未更新的图片在渲染后删除
+        """
+        self.cache_dir = Path(cache_dir)
+        self.indicators = {**DEFAULT_INDICATORS, **(indicators or {})}
+        self.lookback = lookback
+        self.max_workers = max_workers
+        self.time_budget = time_budget
+        self.width_px = width_px
+        self.height_px = height_px
+        self.colors = colors
+        self.cache_days = cache_days
+
+    def chart_path(self, bars: pd.DataFrame, title: str = "") -> Path:
+        """返回该组 K 线（及标题）对应的缓存图片路径"""
+        key = chart_cache_key(
+            bars, self.indicators, self.lookback, title, self.width_px, self.height_px, self.colors
+        )
+        return self.cache_dir / f"{key}.png"
+
+    def render_all(
+        self,
+        bars_by_code: Dict[str, pd.DataFrame],
+        names: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Path]:
+        """
+        渲染全部自选股图表
+
+        Args:
+            bars_by_code: {股票代码: OHLCV DataFrame}
+            names: {股票代码: 股票名称}，用于图表标题
+
+        Returns:
+            {股票代码: 图片路径}，未能在时间预算内完成的股票不在结果中
+        """
+        names = names or {}
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        results: Dict[str, Path] = {}
+        # 同一路径只渲染一次，完成后分配给所有对应的股票
+        pending: Dict[Path, tuple] = {}
+        for code, bars in bars_by_code.items():
+            if bars is None or bars.empty:
+                continue
+            title = f"{code} {names.get(code, '')}".strip()
+            path = self.chart_path(bars, title)
+            if path.exists():
+                # 刷新修改时间，命中的缓存不会被清理
+                os.utime(path)
+                results[code] = path
+            elif path in pending:
+                pending[path][2].append(code)
+            else:
+                pending[path] = (bars[BAR_COLUMNS], title, [code])
+
+        if not pending:
+            self.prune_cache(results.values())
+            return results
+
+        workers = min(self.max_workers or os.cpu_count() or 1, len(pending))
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = {
+                executor.submit(
+                    _render_chart,
+                    bars.reset_index(drop=True),
+                    title,
+                    self.indicators,
+                    self.lookback,
+                    str(path),
+                    self.width_px,
+                    self.height_px,
+                    self.colors,
+                ): (codes, path)
+                for path, (bars, title, codes) in pending.items()
+            }
+            done, _ = wait(futures, timeout=self.time_budget)
+            for future in done:
+                codes, path = futures[future]
+                if future.exception() is None:
+                    for code in codes:
+                        results[code] = path
+        finally:
+            # 超时的任务不再等待，已开始的子进程写完临时文件后自行退出
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self.prune_cache(results.values())
+        return results
+
+    def prune_cache(self, keep: Iterable[Path] = ()) -> int:
+        """
+        删除超过 cache_days 天未更新的缓存图片及残留临时文件
+
+        Args:
+            keep: 本次用到的图片，无论新旧都保留
+
+        Returns:
+            删除的文件数
+        """
+        keep = set(keep)
+        cutoff = time.time() - self.cache_days * 86400
+        removed = 0
+        for path in list(self.cache_dir.glob("*.png")) + list(self.cache_dir.glob("*.tmp")):
+            if path in keep:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
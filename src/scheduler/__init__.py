@@ -5,5 +5,10 @@
 - 盘前报告: 每日 08:30
 - 盘后报告: 每日 15:30
 - 手动触发接口
+- 多订阅者报告分发
 """
 
+from .fanout import MarketSnapshot, Subscriber, load_subscribers, run_multi_tenant
+
+__all__ = ["MarketSnapshot", "Subscriber", "load_subscribers", "run_multi_tenant"]
+
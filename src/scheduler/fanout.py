@@ -0,0 +1,185 @@
+"""
+多订阅者报告分发
+
+每个订阅者维护自己的 watchlist.yaml。多租户模式下流程为:
+1. 合并所有订阅者的自选股，得到去重后的代码集合
+2. 每只股票只采集、分析一次，写入共享快照 MarketSnapshot
+3. 基于同一份快照并行渲染每个订阅者的报告
+
+采集/分析开销只随去重后的股票数增长，与订阅者数量无关
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import yaml
+
+
+@dataclass
+class Subscriber:
+    """订阅者及其自选股"""
+
+    name: str
+    watchlist: List[dict]
+
+    @property
+    def codes(self) -> List[str]:
+        """股票代码，纯数字代码补齐为 6 位"""
+        return [normalize_code(item["code"]) for item in self.watchlist]
+
+
+def normalize_code(code: Any) -> str:
+    """纯数字代码补齐为 6 位（如 "858" → "000858"），其他代码原样返回"""
+    code = str(code).strip()
+    return code.zfill(6) if code.isdigit() else code
+
+
+@dataclass
+class MarketSnapshot:
+    """一次运行的共享数据快照，所有订阅者只读"""
+
+    report_date: date
+    market: Dict[str, Any] = field(default_factory=dict)
+    stocks: Dict[str, Any] = field(default_factory=dict)
+
+    def for_subscriber(self, subscriber: Subscriber) -> Dict[str, Any]:
+        """按订阅者自选股顺序取出其个股数据，缺失的股票跳过"""
+        return {code: self.stocks[code] for code in subscriber.codes if code in self.stocks}
+
+
+def load_subscribers(subscribers_dir: Path) -> List[Subscriber]:
+    """
+    加载订阅者配置
+
+    目录结构: <subscribers_dir>/<订阅者>/watchlist.yaml，格式与 config/watchlist.yaml 相同
+
+    股票代码必须加引号写成字符串：YAML 会把未加引号的 000001 读成 1、002415
+    按八进制读成 1293，无法还原，这类条目直接跳过并给出警告
+    """
+    subscribers = []
+    for path in sorted(Path(subscribers_dir).glob("*/watchlist.yaml")):
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+        watchlist = []
+        for item in data.get("watchlist") or []:
+            if not isinstance(item.get("code"), str):
+                print(f"⚠️ {path}: 股票代码 {item.get('code')!r} 不是字符串，请加引号，已跳过")
+                continue
+            watchlist.append(item)
+        subscribers.append(Subscriber(name=path.parent.name, watchlist=watchlist))
+    return subscribers
+
+
+def union_codes(subscribers: Iterable[Subscriber]) -> List[str]:
+    """合并所有订阅者的股票代码，保持首次出现的顺序"""
+    return list(dict.fromkeys(code for sub in subscribers for code in sub.codes))
+
+
+def build_snapshot(
+    codes: List[str],
+    collect_stock: Callable[[str], Any],
+    analyze_stock: Callable[[str, Any], Any],
+    collect_market: Optional[Callable[[], Dict[str, Any]]] = None,
+    report_date: Optional[date] = None,
+    max_workers: int = 8,
+) -> MarketSnapshot:
+    """
+    采集并分析每只股票一次，生成共享快照
+
+    采集以网络 I/O 为主，使用线程池；单只股票或大盘数据失败不影响其他部分
+    """
+    snapshot = MarketSnapshot(report_date=report_date or date.today())
+
+    def process(code: str):
+        try:
+            return code, analyze_stock(code, collect_stock(code))
+        except Exception as e:
+            print(f"⚠️ {code} 采集/分析失败: {e}")
+            return code, None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        market_future = executor.submit(collect_market) if collect_market else None
+        for code, result in executor.map(process, codes):
+            if result is not None:
+                snapshot.stocks[code] = result
+        if market_future is not None:
+            try:
+                snapshot.market = market_future.result()
+            except Exception as e:
+                print(f"⚠️ 大盘数据采集失败: {e}")
+
+    return snapshot
+
+
+# 子进程内的快照副本，由 initializer 注入，避免每个任务重复序列化
+_worker_snapshot: Optional[MarketSnapshot] = None
+
+
+def _init_worker(snapshot: MarketSnapshot) -> None:
+    global _worker_snapshot
+    _worker_snapshot = snapshot
+
+
+def _render_in_worker(render: Callable, subscriber: Subscriber):
+    return render(subscriber, _worker_snapshot)
+
+
+def fan_out(
+    subscribers: List[Subscriber],
+    snapshot: MarketSnapshot,
+    render: Callable[[Subscriber, MarketSnapshot], Any],
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    基于共享快照并行渲染每个订阅者的报告
+
+    渲染（模板 + PDF）为 CPU 密集型，使用进程池；快照在每个子进程初始化时传入一次。
+    render 必须是模块级函数以便序列化
+
+    Returns:
+        {订阅者名称: render 返回值}，渲染失败的订阅者值为 None
+    """
+    results: Dict[str, Any] = {}
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(snapshot,),
+    ) as executor:
+        futures = {
+            sub.name: executor.submit(_render_in_worker, render, sub)
+            for sub in subscribers
+        }
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"⚠️ {name} 报告渲染失败: {e}")
+                results[name] = None
+    return results
+
+
+def run_multi_tenant(
+    subscribers: List[Subscriber],
+    collect_stock: Callable[[str], Any],
+    analyze_stock: Callable[[str, Any], Any],
+    render: Callable[[Subscriber, MarketSnapshot], Any],
+    collect_market: Optional[Callable[[], Dict[str, Any]]] = None,
+    report_date: Optional[date] = None,
+    collect_workers: int = 8,
+    render_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """多租户模式入口：合并 → 一次采集分析 → 并行分发"""
+    codes = union_codes(subscribers)
+    print(f"👥 {len(subscribers)} 个订阅者，去重后 {len(codes)} 只股票")
+    snapshot = build_snapshot(
+        codes,
+        collect_stock,
+        analyze_stock,
+        collect_market=collect_market,
+        report_date=report_date,
+        max_workers=collect_workers,
+    )
+    return fan_out(subscribers, snapshot, render, max_workers=render_workers)
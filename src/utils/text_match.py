@@ -0,0 +1,153 @@
+"""
+文本匹配工具
+
+- AhoCorasick: 多模式串一次扫描匹配，用于新闻 → 自选股打标
+- SimHashIndex: 近似重复检测索引，可持久化
+"""
+
+import hashlib
+import re
+from collections import Counter, deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick 自动机
+
+    构建一次后，单次扫描即可找出文本中出现的全部模式串，耗时与文本长度线性相关，
+    与模式串数量无关
+    """
+
+    def __init__(self, patterns: Dict[str, str]):
+        """
+        Args:
+            patterns: {模式串: 关联值}，如 {"贵州茅台": "600519", "600519": "600519"}
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, str]]] = [[]]
+
+        for pattern, value in patterns.items():
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((pattern, value))
+
+        # BFS 构建失败指针，并把失败链上的输出合并到当前节点；根的子节点失败指针恒为根
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[int, str, str]]:
+        """逐个产出 (起始位置, 模式串, 关联值)"""
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for pattern, value in self._out[node]:
+                yield i - len(pattern) + 1, pattern, value
+
+
+_TOKEN_RE = re.compile(r"[一-鿿]|[a-zA-Z0-9]+")
+
+
+def simhash(text: str, bits: int = 64) -> int:
+    """
+    计算 SimHash 指纹
+
+    中文按字切分后取相邻二元组，英文/数字按词切分，以词频加权
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    features = Counter(a + b for a, b in zip(tokens, tokens[1:])) or Counter(tokens)
+
+    weights = [0] * bits
+    for feature, count in features.items():
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=bits // 8).digest(), "big")
+        for i in range(bits):
+            weights[i] += count if (h >> i) & 1 else -count
+
+    fingerprint = 0
+    for i, w in enumerate(weights):
+        if w > 0:
+            fingerprint |= 1 << i
+    return fingerprint
+
+
+class SimHashIndex:
+    """
+    SimHash 近似重复索引
+
+    按鸽巢原理把 64 位指纹切成 (max_distance + 1) 段，汉明距离不超过 max_distance
+    的两个指纹至少有一段完全相同，因此只需比较同段桶中的候选
+    """
+
+    def __init__(self, max_distance: int = 3, bits: int = 64):
+        self.max_distance = max_distance
+        self.bits = bits
+        self._bands = max_distance + 1
+        self._band_bits = bits // self._bands
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(self._bands)]
+        self._entries: Dict[int, float] = {}  # 指纹 -> 入库时间戳
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _band_keys(self, fingerprint: int) -> List[int]:
+        mask = (1 << self._band_bits) - 1
+        return [(fingerprint >> (i * self._band_bits)) & mask for i in range(self._bands)]
+
+    def find(self, fingerprint: int) -> Optional[int]:
+        """返回索引中与之近似重复的指纹，不存在则返回 None"""
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            for candidate in self._buckets[band].get(key, ()):
+                if bin(candidate ^ fingerprint).count("1") <= self.max_distance:
+                    return candidate
+        return None
+
+    def add(self, fingerprint: int, timestamp: float = 0.0) -> None:
+        if fingerprint in self._entries:
+            return
+        self._entries[fingerprint] = timestamp
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            self._buckets[band].setdefault(key, []).append(fingerprint)
+
+    def prune(self, before: float) -> int:
+        """删除入库时间早于 before 的指纹，返回删除数量"""
+        expired = [fp for fp, ts in self._entries.items() if ts < before]
+        if not expired:
+            return 0
+        keep = [(fp, ts) for fp, ts in self._entries.items() if ts >= before]
+        self._buckets = [{} for _ in range(self._bands)]
+        self._entries = {}
+        for fp, ts in keep:
+            self.add(fp, ts)
+        return len(expired)
+
+    def to_list(self) -> List[Tuple[str, float]]:
+        """导出为可 JSON 序列化的列表（指纹以十六进制字符串保存）"""
+        return [(format(fp, "x"), ts) for fp, ts in self._entries.items()]
+
+    @classmethod
+    def from_list(cls, items: Iterable[Tuple[str, float]], max_distance: int = 3) -> "SimHashIndex":
+        index = cls(max_distance=max_distance)
+        for fp, ts in items:
+            index.add(int(fp, 16), ts)
+        return index
@@ -0,0 +1,103 @@
+"""
+K 线图渲染测试
+"""
+
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from src.analyzers.technical import calc_boll, calc_macd
+from src.reports.charts import DEFAULT_INDICATORS, ChartRenderer, chart_cache_key, chart_frame
+
+
+class TestChartFrame:
+    """绘图数据"""
+
+    def test_indicators_use_full_history(self, sample_ohlcv_data):
+        frame = chart_frame(sample_ohlcv_data, DEFAULT_INDICATORS, lookback=5)
+        full_macd = calc_macd(sample_ohlcv_data["close"]).tail(5).reset_index(drop=True)
+        full_boll = calc_boll(sample_ohlcv_data["close"]).tail(5).reset_index(drop=True)
+
+        assert len(frame) == 5
+        assert frame["close"].tolist() == sample_ohlcv_data["close"].tail(5).tolist()
+        pd.testing.assert_frame_equal(frame[["dif", "dea", "hist"]], full_macd)
+        pd.testing.assert_frame_equal(frame[["mid", "upper", "lower"]], full_boll)
+
+
+class TestCacheKey:
+    """缓存键"""
+
+    def test_render_params_and_title_change_key(self, sample_ohlcv_data):
+        base = chart_cache_key(sample_ohlcv_data, DEFAULT_INDICATORS, 120, "600519 贵州茅台")
+        assert base == chart_cache_key(sample_ohlcv_data, DEFAULT_INDICATORS, 120, "600519 贵州茅台")
+        assert base != chart_cache_key(sample_ohlcv_data, DEFAULT_INDICATORS, 120, "000858 五粮液")
+        assert base != chart_cache_key(sample_ohlcv_data, DEFAULT_INDICATORS, 120, "600519 贵州茅台", width_px=300)
+        assert base != chart_cache_key(sample_ohlcv_data, DEFAULT_INDICATORS, 120, "600519 贵州茅台", height_px=200)
+        assert base != chart_cache_key(sample_ohlcv_data, DEFAULT_INDICATORS, 120, "600519 贵州茅台", colors=8)
+        assert base != chart_cache_key(sample_ohlcv_data, DEFAULT_INDICATORS, 60, "600519 贵州茅台")
+
+    def test_earlier_history_changes_key(self, sample_ohlcv_data):
+        # 早于绘制区间的 K 线也会影响 EMA，必须参与哈希
+        changed = sample_ohlcv_data.copy()
+        changed.loc[0, "close"] += 1
+        assert chart_cache_key(sample_ohlcv_data, DEFAULT_INDICATORS, 5) != chart_cache_key(
+            changed, DEFAULT_INDICATORS, 5
+        )
+
+
+class TestRenderAll:
+    """渲染与缓存"""
+
+    def test_cache_hit_skips_render(self, tmp_path, sample_ohlcv_data):
+        renderer = ChartRenderer(cache_dir=tmp_path)
+        path = renderer.chart_path(sample_ohlcv_data, "600519 贵州茅台")
+        path.write_bytes(b"cached")
+
+        results = renderer.render_all({"600519": sample_ohlcv_data}, {"600519": "贵州茅台"})
+
+        assert results == {"600519": path}
+        assert path.read_bytes() == b"cached"
+
+    def test_cache_miss_renders(self, tmp_path, sample_ohlcv_data):
+        pytest.importorskip("matplotlib")
+        Image = pytest.importorskip("PIL.Image")
+
+        renderer = ChartRenderer(cache_dir=tmp_path, max_workers=1, width_px=300, height_px=200, colors=8)
+        results = renderer.render_all(
+            {"600519": sample_ohlcv_data, "000858": sample_ohlcv_data},
+            {"600519": "贵州茅台", "000858": "五粮液"},
+        )
+
+        # 同一组 K 线、不同标题各出一张图
+        assert set(results) == {"600519", "000858"}
+        assert results["600519"] != results["000858"]
+        for path in results.values():
+            with Image.open(path) as image:
+                assert image.mode == "P"
+        assert not list(tmp_path.glob("*.tmp"))
+
+        # 尺寸变化后不复用旧图
+        other = ChartRenderer(cache_dir=tmp_path, width_px=900, height_px=600)
+        assert other.chart_path(sample_ohlcv_data, "600519 贵州茅台") != results["600519"]
+
+    def test_stale_cache_is_pruned(self, tmp_path, sample_ohlcv_data):
+        renderer = ChartRenderer(cache_dir=tmp_path, cache_days=7)
+        hit = renderer.chart_path(sample_ohlcv_data, "600519 贵州茅台")
+        stale = tmp_path / "stale.png"
+        fresh = tmp_path / "fresh.png"
+        leftover = tmp_path / "leftover.tmp"
+        for path in (hit, stale, fresh, leftover):
+            path.write_bytes(b"png")
+        old = time.time() - 30 * 86400
+        for path in (hit, stale, leftover):
+            os.utime(path, (old, old))
+
+        results = renderer.render_all({"600519": sample_ohlcv_data}, {"600519": "贵州茅台"})
+
+        # 命中的旧图保留并刷新时间；未用到的过期图片与临时文件被删除
+        assert results == {"600519": hit}
+        assert hit.exists() and hit.stat().st_mtime > old
+        assert fresh.exists()
+        assert not stale.exists() and not leftover.exists()
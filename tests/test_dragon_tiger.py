@@ -0,0 +1,148 @@
+"""
+龙虎榜席位存储测试
+"""
+
+from datetime import date
+
+import pytest
+
+from src.analyzers.dragon_tiger import DragonTigerStore
+
+
+SEAT_A = "华鑫证券上海分公司"
+SEAT_B = "中信证券上海溧阳路"
+
+
+def _day(code, seat, buy, sell=0):
+    return {"code": code, "seat": seat, "buy": buy, "sell": sell}
+
+
+@pytest.fixture
+def store():
+    s = DragonTigerStore(hot_money={SEAT_A: "炒股养家"})
+    s.add_day(date(2024, 1, 2), [_day("600519", SEAT_A, 100), _day("000858", SEAT_B, 50, 20)])
+    s.add_day(date(2024, 1, 3), [_day("600519", SEAT_B, 0, 40)])
+    s.add_day(date(2024, 1, 4), [_day("600519", SEAT_A, 30), _day("300750", SEAT_A, 10)])
+    return s
+
+
+class TestAddDay:
+    """入库"""
+
+    def test_bad_record_leaves_store_untouched(self, tmp_path):
+        db = tmp_path / "lhb.db"
+        s = DragonTigerStore(db_path=db)
+        s.add_day(date(2024, 1, 2), [_day("600519", SEAT_A, 100)])
+
+        with pytest.raises(ValueError):
+            s.add_day(date(2024, 1, 3), [_day("000858", SEAT_B, 10), _day("600519", "新席位", "bad")])
+
+        assert len(s) == 1
+        assert s.seat_count == 1
+        assert s.seat_activity(SEAT_B) == []
+        assert s.seat_activity("新席位") == []
+
+        # 修正后同一日期可以重试
+        assert s.add_day(date(2024, 1, 3), [_day("000858", SEAT_B, 10), _day("600519", "新席位", 5)]) == 2
+        assert s.seat_net_by_code("新席位") == {"600519": 5.0}
+        s.close()
+
+        reloaded = DragonTigerStore(db_path=db)
+        assert len(reloaded) == 3
+        assert reloaded.seat_count == 3
+        reloaded.close()
+
+    def test_duplicate_day_is_skipped(self, store):
+        assert store.add_day(date(2024, 1, 3), [_day("600519", SEAT_A, 1)]) == 0
+        assert len(store) == 5
+
+    def test_out_of_order_day_raises(self, store):
+        with pytest.raises(ValueError):
+            store.add_day(date(2023, 12, 29), [_day("600519", SEAT_A, 1)])
+
+
+class TestQueries:
+    """窗口查询"""
+
+    def test_seat_activity_window(self, store):
+        assert [r["code"] for r in store.seat_activity(SEAT_A, days=1)] == ["600519", "300750"]
+        assert len(store.seat_activity(SEAT_A, days=3)) == 3
+        assert store.seat_activity(SEAT_A, days=1, end=date(2024, 1, 3)) == []
+        assert store.seat_activity(SEAT_A, days=1, end=date(2024, 1, 2))[0]["net"] == 100
+        assert store.seat_activity(SEAT_A, end=date(2024, 1, 1)) == []
+        assert store.seat_activity("不存在的席位") == []
+
+    def test_end_between_trading_days(self, store):
+        # 非交易日截止时取之前最近的交易日
+        records = store.seat_activity(SEAT_B, days=1, end=date(2024, 1, 3))
+        assert records == [{"date": date(2024, 1, 3), "code": "600519", "net": -40.0}]
+
+    def test_seat_net_by_code(self, store):
+        assert store.seat_net_by_code(SEAT_A) == {"600519": 130.0, "300750": 10.0}
+
+    def test_code_seats(self, store):
+        assert store.code_seats("600519") == {SEAT_A: 130.0, SEAT_B: -40.0}
+        assert store.code_seats("600519", days=2) == {SEAT_A: 30.0, SEAT_B: -40.0}
+        assert store.code_seats("600519", hot_money_only=True) == {SEAT_A: 130.0}
+        assert store.code_seats("000001") == {}
+
+
+class TestPersistence:
+    """SQLite 持久化"""
+
+    def test_reload_rebuilds_indexes(self, tmp_path):
+        db = tmp_path / "lhb.db"
+        s = DragonTigerStore(db_path=db)
+        s.add_day(date(2024, 1, 2), [_day("600519", SEAT_A, 100), _day("000858", SEAT_B, 50)])
+        s.add_day(date(2024, 1, 3), [_day("600519", SEAT_B, 0, 40)])
+        s.close()
+
+        reloaded = DragonTigerStore(db_path=db)
+        assert len(reloaded) == 3
+        assert reloaded.seat_count == 2
+        assert reloaded.code_seats("600519") == {SEAT_A: 100.0, SEAT_B: -40.0}
+        assert reloaded.seat_activity(SEAT_B, days=1) == [
+            {"date": date(2024, 1, 3), "code": "600519", "net": -40.0}
+        ]
+        # 重新加载后继续追加
+        assert reloaded.add_day(date(2024, 1, 2), [_day("600519", SEAT_A, 1)]) == 0
+        assert reloaded.add_day(date(2024, 1, 4), [_day("300750", "新席位", 5)]) == 1
+        assert reloaded.seat_count == 3
+        reloaded.close()
+
+    def test_empty_day_survives_reload(self, tmp_path):
+        db = tmp_path / "lhb.db"
+        s = DragonTigerStore(db_path=db)
+        s.add_day(date(2024, 1, 2), [_day("600519", SEAT_A, 100)])
+        assert s.add_day(date(2024, 1, 3), []) == 0
+        assert s.seat_activity(SEAT_A, days=1) == []
+        s.close()
+
+        reloaded = DragonTigerStore(db_path=db)
+        assert reloaded.seat_activity(SEAT_A, days=1) == []
+        assert len(reloaded.seat_activity(SEAT_A, days=2)) == 1
+        # 空交易日同样算已入库
+        assert reloaded.add_day(date(2024, 1, 3), [_day("600519", SEAT_A, 1)]) == 0
+        reloaded.add_day(date(2024, 1, 4), [_day("600519", SEAT_B, 5)])
+        assert reloaded.code_seats("600519", days=2) == {SEAT_B: 5.0}
+        reloaded.close()
+
+    def test_legacy_db_without_days_table(self, tmp_path):
+        import sqlite3
+
+        db = tmp_path / "lhb.db"
+        conn = sqlite3.connect(str(db))
+        conn.executescript(
+            """
+            CREATE TABLE seats (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);
+            CREATE TABLE records (day INTEGER NOT NULL, code TEXT NOT NULL, seat_id INTEGER NOT NULL, net REAL NOT NULL);
+            """
+        )
+        conn.execute("INSERT INTO seats VALUES (0, ?)", (SEAT_A,))
+        conn.execute("INSERT INTO records VALUES (?, '600519', 0, 100)", (date(2024, 1, 2).toordinal(),))
+        conn.commit()
+        conn.close()
+
+        store = DragonTigerStore(db_path=db)
+        assert store.seat_activity(SEAT_A, days=1)[0]["net"] == 100
+        store.close()
@@ -0,0 +1,75 @@
+"""
+多订阅者分发测试
+"""
+
+from datetime import date
+
+from src.scheduler.fanout import MarketSnapshot, Subscriber, build_snapshot, load_subscribers, union_codes
+
+
+def _collect(code):
+    if code == "000001":
+        raise RuntimeError("接口超时")
+    return {"close": 10.0}
+
+
+def _analyze(code, bars):
+    return {"code": code, "close": bars["close"]}
+
+
+class TestBuildSnapshot:
+    """共享快照"""
+
+    def test_stock_failure_is_isolated(self):
+        snapshot = build_snapshot(["600519", "000001", "000858"], _collect, _analyze)
+        assert list(snapshot.stocks) == ["600519", "000858"]
+
+    def test_market_failure_is_isolated(self):
+        def broken_market():
+            raise RuntimeError("大盘接口异常")
+
+        snapshot = build_snapshot(
+            ["600519"], _collect, _analyze, collect_market=broken_market, report_date=date(2024, 1, 2)
+        )
+        assert snapshot.market == {}
+        assert snapshot.stocks == {"600519": {"code": "600519", "close": 10.0}}
+
+    def test_market_data(self):
+        snapshot = build_snapshot(["600519"], _collect, _analyze, collect_market=lambda: {"index": 3000})
+        assert snapshot.market == {"index": 3000}
+
+
+class TestSubscribers:
+    """订阅者合并"""
+
+    def test_union_keeps_first_seen_order(self):
+        subs = [
+            Subscriber("a", [{"code": "600519"}, {"code": "858"}]),
+            Subscriber("b", [{"code": "000858"}, {"code": "300750"}]),
+        ]
+        assert union_codes(subs) == ["600519", "000858", "300750"]
+
+    def test_load_skips_unquoted_codes(self, tmp_path, capsys):
+        (tmp_path / "alice").mkdir()
+        (tmp_path / "alice" / "watchlist.yaml").write_text(
+            "watchlist:\n"
+            "  - code: \"000001\"\n"
+            "  - code: 002415\n"  # YAML 1.1 八进制 → 1293
+            "  - code: 600519\n"  # 整数
+            "  - code: \"858\"\n",
+            encoding="utf-8",
+        )
+        (tmp_path / "bob").mkdir()
+        (tmp_path / "bob" / "watchlist.yaml").write_text("watchlist:\n  - code: '000858'\n", encoding="utf-8")
+
+        alice, bob = load_subscribers(tmp_path)
+        assert alice.name == "alice"
+        assert alice.codes == ["000001", "000858"]
+        assert union_codes([alice, bob]) == ["000001", "000858"]
+        out = capsys.readouterr().out
+        assert "1293" in out and "600519" in out
+
+    def test_for_subscriber_skips_missing(self):
+        snapshot = MarketSnapshot(report_date=date(2024, 1, 2), stocks={"600519": 1, "300750": 2})
+        sub = Subscriber("a", [{"code": "300750"}, {"code": "000001"}, {"code": "600519"}])
+        assert snapshot.for_subscriber(sub) == {"300750": 2, "600519": 1}
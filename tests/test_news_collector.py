@@ -0,0 +1,107 @@
+"""
+新闻增量采集测试
+"""
+
+import pytest
+
+from src.collectors.news_collector import NewsCollector
+from src.utils.text_match import simhash
+
+
+ARTICLE = (
+    "贵州茅台发布年度经营数据，全年营业总收入同比增长百分之十七，归母净利润同比增长百分之十九，"
+    "公司拟每十股派发现金红利二百五十九元，董事会表示将继续推进渠道改革与数字化营销。"
+)
+# 转载稿：仅改动个别字
+REPOST = ARTICLE.replace("继续", "持续")
+OTHER = "五粮液召开股东大会，审议通过利润分配方案，管理层介绍了新品规划与渠道库存情况。"
+
+
+def _item(title, content, published_at, url=""):
+    return {"title": title, "content": content, "published_at": published_at, "url": url}
+
+
+class FakeSource:
+    """按高水位返回条目，并记录每次收到的高水位"""
+
+    def __init__(self, items):
+        self.items = items
+        self.marks = []
+
+    def __call__(self, mark):
+        self.marks.append(mark)
+        return list(self.items)
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return tmp_path / "news_state.json"
+
+
+class TestCollect:
+    """增量采集"""
+
+    def test_repost_fixture_is_near_duplicate(self):
+        # 指纹基于 "标题 正文"
+        original = simhash(f"茅台年报 {ARTICLE}")
+        assert bin(original ^ simhash(f"茅台年报 {REPOST}")).count("1") <= 3
+        assert bin(original ^ simhash(f"五粮液股东大会 {OTHER}")).count("1") > 3
+
+    def test_near_duplicate_suppressed_across_runs(self, sample_watchlist, state_path):
+        first = NewsCollector({"a": FakeSource([_item("茅台年报", ARTICLE, "2024-03-01T09:00")])},
+                              sample_watchlist, state_path=state_path)
+        assert len(first.collect()) == 1
+        first.commit()
+
+        # 新进程、另一个源转载同一事件
+        second = NewsCollector(
+            {"b": FakeSource([_item("茅台年报", REPOST, "2024-03-01T10:00"),
+                              _item("五粮液股东大会", OTHER, "2024-03-01T11:00")])},
+            sample_watchlist,
+            state_path=state_path,
+        )
+        df = second.collect()
+        assert df["title"].tolist() == ["五粮液股东大会"]
+
+    def test_high_water_skips_older_items(self, sample_watchlist, state_path):
+        source = FakeSource([
+            _item("旧闻", OTHER, "2024-03-01T09:00"),
+            _item("茅台年报", ARTICLE, "2024-03-02T09:00"),
+        ])
+        collector = NewsCollector({"a": source}, sample_watchlist, state_path=state_path)
+        assert len(collector.collect()) == 2
+        collector.commit()
+
+        source.items.append(_item("新条目", "宁德时代发布新一代电池技术", "2024-03-03T09:00"))
+        df = collector.collect()
+        assert source.marks == [None, "2024-03-02T09:00"]
+        assert df["title"].tolist() == ["新条目"]
+
+    def test_state_not_persisted_without_commit(self, sample_watchlist, state_path):
+        source = FakeSource([_item("茅台年报", ARTICLE, "2024-03-01T09:00")])
+        collector = NewsCollector({"a": source}, sample_watchlist, state_path=state_path)
+        assert len(collector.collect()) == 1
+        assert not state_path.exists()
+
+        # 交接失败未提交：重试时同一批条目仍会返回
+        assert len(collector.collect()) == 1
+        assert source.marks == [None, None]
+
+        collector.commit()
+        reloaded = NewsCollector({"a": source}, sample_watchlist, state_path=state_path)
+        assert reloaded.high_water == {"a": "2024-03-01T09:00"}
+        assert reloaded.collect().empty
+
+
+class TestTagCodes:
+    """自选股打标"""
+
+    def test_name_and_code(self, sample_watchlist, state_path):
+        collector = NewsCollector({}, sample_watchlist, state_path=state_path)
+        assert collector.tag_codes("五粮液(000858)与贵州茅台") == ["000858", "600519"]
+
+    def test_numeric_code_boundary(self, sample_watchlist, state_path):
+        collector = NewsCollector({}, sample_watchlist, state_path=state_path)
+        assert collector.tag_codes("代码1600519的公告") == []
+        assert collector.tag_codes("成交额6005190元") == []
+        assert collector.tag_codes("600519.SH 涨停") == ["600519"]
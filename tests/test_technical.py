@@ -0,0 +1,58 @@
+"""
+技术指标测试
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.analyzers.technical import calc_boll, calc_macd
+
+
+class TestMACD:
+    """MACD"""
+
+    def test_columns_and_hist(self, sample_ohlcv_data):
+        macd = calc_macd(sample_ohlcv_data["close"])
+        assert list(macd.columns) == ["dif", "dea", "hist"]
+        assert len(macd) == len(sample_ohlcv_data)
+        np.testing.assert_allclose(macd["hist"], 2 * (macd["dif"] - macd["dea"]))
+
+    def test_matches_manual_ema(self, sample_ohlcv_data):
+        close = sample_ohlcv_data["close"]
+        macd = calc_macd(close, fast=3, slow=6, signal=4)
+
+        def ema(values, span):
+            alpha = 2 / (span + 1)
+            out = [values[0]]
+            for v in values[1:]:
+                out.append(alpha * v + (1 - alpha) * out[-1])
+            return np.array(out)
+
+        dif = ema(close.to_numpy(), 3) - ema(close.to_numpy(), 6)
+        np.testing.assert_allclose(macd["dif"], dif)
+        np.testing.assert_allclose(macd["dea"], ema(dif, 4))
+
+    def test_uptrend_is_positive(self, sample_ohlcv_data):
+        macd = calc_macd(sample_ohlcv_data["close"])
+        assert (macd["dif"].iloc[1:] > 0).all()
+
+    def test_flat_series_is_zero(self):
+        macd = calc_macd(pd.Series([10.0] * 40))
+        assert (macd.abs() < 1e-12).all().all()
+
+
+class TestBOLL:
+    """布林带"""
+
+    def test_warmup_is_nan(self, sample_ohlcv_data):
+        boll = calc_boll(sample_ohlcv_data["close"], period=5)
+        assert boll.iloc[:4].isna().all().all()
+        assert boll.iloc[4:].notna().all().all()
+
+    def test_bands(self, sample_ohlcv_data):
+        close = sample_ohlcv_data["close"]
+        boll = calc_boll(close, period=5, std=2)
+        np.testing.assert_allclose(boll["mid"], close.rolling(5).mean())
+        width = close.rolling(5).std(ddof=0) * 2
+        np.testing.assert_allclose(boll["upper"] - boll["mid"], width)
+        np.testing.assert_allclose(boll["mid"] - boll["lower"], width)